@@ -1,21 +1,51 @@
+import os
 import re
-from io import BytesIO
+import queue
+import random
+import socket
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Tuple
-from urllib.parse import urljoin
+from typing import Optional, Callable, Dict, Any, FrozenSet, List, Tuple
+from urllib.parse import unquote, urljoin, urlsplit, urlunsplit
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
 import streamlit as st
 import streamlit.components.v1 as components
-from bs4 import BeautifulSoup
 from spellchecker import SpellChecker
 
+from article_analysis import (
+    WordVerdictCache,
+    analyze_body_job,
+    count_typos,
+    dictionary_words,
+    extract_links_images,
+    init_worker,
+    learn_terms,
+    load_spellchecker,
+)
+
 # ✅ Logging
 import json
 import time
 import uuid
 import hashlib
+import tempfile
+import gzip
+import io
+import importlib.util
 import logging
 import traceback
 
@@ -26,8 +56,87 @@ APP_TITLE = "ZenAudit"
 APP_ICON = "🛡️"
 
 FREE_FINDING_LIMIT = 50
+# Findings table: rows rendered per page (HTML is built only for the visible page).
+TABLE_PAGE_SIZES = (25, 50, 100, 250)
+TABLE_DEFAULT_PAGE_SIZE = 50
+# While a scan runs, the live table shows at most this many of the newest findings (unsorted, no index),
+# so each refresh costs the same however many findings the scan has produced.
+LIVE_FINDINGS_ROWS = 250
 REQUEST_TIMEOUT = 12
 ZENDESK_PER_PAGE = 100
+# Pages fetched ahead of the scan loop (bounded, so memory stays flat on large KBs).
+ZENDESK_PREFETCH_PAGES = 2
+# Article listing: "cursor" (page[size]/links.next), "offset" (legacy per_page/next_page)
+# or "incremental" (Help Center incremental export, used for "changed since" scans).
+ZENDESK_LIST_MODES = ("cursor", "offset", "incremental")
+ZENDESK_LIST_MODE = str(st.secrets.get("ZENDESK_LIST_MODE", "cursor"))
+# Zendesk API retries: 429/5xx, timeouts and connection errors back off exponentially with jitter
+# (or as long as Retry-After / ratelimit-reset asks) until ZENDESK_RETRY_BUDGET_S is spent.
+ZENDESK_RETRY_STATUSES = (429, 500, 502, 503, 504)
+ZENDESK_RETRY_MAX_ATTEMPTS = int(st.secrets.get("ZENDESK_RETRY_MAX_ATTEMPTS", 8))
+ZENDESK_RETRY_BASE_S = 1.0
+ZENDESK_RETRY_MAX_DELAY_S = 60.0
+ZENDESK_RETRY_BUDGET_S = float(st.secrets.get("ZENDESK_RETRY_BUDGET_S", 300))
+
+# Link/image checks are network-bound; run them on a bounded thread pool.
+LINK_CHECK_TIMEOUT = 8
+LINK_CHECK_WORKERS = int(st.secrets.get("LINK_CHECK_WORKERS", 16))
+
+# Scans run on background threads owned by the server process; the page polls them every UI_REFRESH_INTERVAL_MS.
+# At most MAX_CONCURRENT_SCANS run at once per server (the rest queue); finished scans stay attachable for a while.
+UI_REFRESH_INTERVAL_MS = int(st.secrets.get("UI_REFRESH_INTERVAL_MS", 300))
+MAX_CONCURRENT_SCANS = int(st.secrets.get("MAX_CONCURRENT_SCANS", 2))
+SCAN_JOB_RETENTION_S = 3600
+# A queued/running scan owned by a process on another host (shared CACHE_DIR) counts as interrupted
+# once its row hasn't been updated for this long; same-host owners are checked by pid instead.
+SCAN_JOB_STALE_S = int(st.secrets.get("SCAN_JOB_STALE_S", 1800))
+
+# Per-host politeness for link checks (shared by all scans on this server): token bucket
+# (probes/second + burst), concurrent probes per host, and bounded retries on 429/503 + Retry-After.
+LINK_CHECK_HOST_RATE = float(st.secrets.get("LINK_CHECK_HOST_RATE", 10.0))
+LINK_CHECK_HOST_BURST = int(st.secrets.get("LINK_CHECK_HOST_BURST", 20))
+LINK_CHECK_HOST_CONCURRENCY = int(st.secrets.get("LINK_CHECK_HOST_CONCURRENCY", 4))
+LINK_CHECK_RATE_LIMIT_RETRIES = 2
+LINK_CHECK_RETRY_AFTER_MAX_S = 30
+
+# Link canonicalization and redirects: query params dropped before probing/caching ("utm_*" matches a prefix),
+# hops followed per URL, and the chain length at which a working link is reported as redirect-heavy.
+LINK_CHECK_STRIP_PARAMS = tuple(
+    p.strip().lower()
+    for p in str(st.secrets.get("LINK_CHECK_STRIP_PARAMS", "utm_*,gclid,fbclid,msclkid,mc_cid,mc_eid")).split(",")
+    if p.strip()
+)
+LINK_CHECK_MAX_REDIRECTS = 10
+LINK_CHECK_REDIRECT_CHAIN_MIN = int(st.secrets.get("LINK_CHECK_REDIRECT_CHAIN_MIN", 2))
+
+# Keep-alive HTTP pools: (host pools kept, connections per host). Connect errors are retried by the adapter.
+HTTP_POOLS = {
+    "zendesk": (2, int(st.secrets.get("HTTP_POOL_ZENDESK", ZENDESK_PREFETCH_PAGES + 2))),
+    "probe": (int(st.secrets.get("HTTP_POOL_PROBE_HOSTS", 64)), LINK_CHECK_HOST_CONCURRENCY),
+    "worker": (1, int(st.secrets.get("HTTP_POOL_WORKER", 4))),
+}
+HTTP_CONNECT_RETRIES = int(st.secrets.get("HTTP_CONNECT_RETRIES", 1))
+
+# HTML parsing + typo detection are CPU-bound; >1 moves them to a process pool (0/1 = in-process).
+# The pool uses fork (spawn/forkserver children would re-run this script as __main__). Forking a
+# multithreaded process copies any lock another thread holds at that instant (logging, the import lock,
+# urllib3 pools) into the child, where it can never be released. So the workers are forked once, on the
+# first script run, before any scan thread exists, and a pool that breaks is not re-forked: scans fall
+# back to in-process analysis until the server restarts. Other sessions' script threads can still be
+# running at that first fork; set CPU_WORKERS=0 if that risk is unacceptable for a deployment.
+CPU_WORKERS = int(st.secrets.get("CPU_WORKERS", 0))
+
+# Optional pre-serialized pyspellchecker dictionary (.json/.json.gz); empty = bundled English.
+SPELL_DICTIONARY_PATH = str(st.secrets.get("SPELL_DICTIONARY_PATH", ""))
+
+# Local on-disk storage (SQLite), shared by every session and worker process on this server.
+CACHE_DIR = str(st.secrets.get("CACHE_DIR", ".zenaudit_cache"))
+# Persistent URL status cache: healthy results live longer than failures/inconclusive ones.
+URL_CACHE_TTL_OK_S = int(st.secrets.get("URL_CACHE_TTL_OK_S", 24 * 3600))
+URL_CACHE_TTL_FAIL_S = int(st.secrets.get("URL_CACHE_TTL_FAIL_S", 3600))
+URL_CACHE_MAX_ENTRIES = int(st.secrets.get("URL_CACHE_MAX_ENTRIES", 200_000))
+# Bump when article analysis changes so stored per-article results are recomputed.
+ANALYSIS_VERSION = 2
 
 st.set_page_config(page_title=f"{APP_TITLE} Pro", page_icon=APP_ICON, layout="wide")
 
@@ -50,8 +159,6 @@ components.html(
     width=0,
 )
 
-spell = SpellChecker()
-
 # =========================
 # ✅ Google Ads Conversion (Scan completed)
 # =========================
@@ -62,11 +169,11 @@ def ads_conversion(send_to: str, transaction_id: str = ""):
     """
     Fires a Google Ads conversion event using gtag.
     Uses a retry loop to ensure gtag is loaded (Streamlit can execute before gtag is ready).
-    transaction_id helps dedupe if Streamlit reruns.
+    transaction_id helps dedupe if Streamlit reruns; it is sent hashed, so a scan_id never leaves the app.
     """
     payload = {"send_to": send_to}
     if transaction_id:
-        payload["transaction_id"] = transaction_id
+        payload["transaction_id"] = hashlib.sha256(transaction_id.encode("utf-8")).hexdigest()[:32]
 
     components.html(
         f"""
@@ -396,17 +503,158 @@ div[data-testid="metric-container"]{
 # =========================
 # 3) SESSION STATE
 # =========================
+def new_scan_counters() -> Dict[str, int]:
+    """Running totals shown while scanning; kept in step with scan_results/findings so the UI never recounts them."""
+    return {"scanned": 0, "critical": 0, "warning": 0, "alt_missing": 0, "stale": 0}
+
+FINDING_COLUMNS = (
+    "Severity",
+    "Type",
+    "Article Title",
+    "Article URL",
+    "Target URL",
+    "HTTP Status",
+    "Detail",
+    "Suggested Fix",
+)
+
+class FindingsStore:
+    """
+    Append-only findings for one scan, kept column by column with repeated strings (severity, type,
+    titles, URLs, fixes) interned, instead of one dict per finding.
+    DataFrames are built from the columns once per `version` and cached; treat them as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cols: Dict[str, List[Any]] = {c: [] for c in FINDING_COLUMNS}
+        self._strings: Dict[str, str] = {}
+        self.version = 0
+        self._frames: Dict[str, Tuple[int, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cols["Severity"])
+
+    def _intern(self, v: Any) -> Any:
+        if isinstance(v, str):
+            return self._strings.setdefault(v, v)
+        return v
+
+    def extend(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            for c, col in self._cols.items():
+                col.extend(self._intern(r.get(c)) for r in rows)
+            self.version += 1
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Findings start:stop as dicts (for checkpoints/exports that need records)."""
+        with self._lock:
+            cols = {c: col[start:stop] for c, col in self._cols.items()}
+        return [dict(zip(FINDING_COLUMNS, vals)) for vals in zip(*cols.values())]
+
+    def report_frame(self) -> pd.DataFrame:
+        """All findings ordered for the report: by severity, then type."""
+
+        def build(cols: Dict[str, List[Any]]) -> pd.DataFrame:
+            df = pd.DataFrame(cols, columns=list(FINDING_COLUMNS))
+            if df.empty:
+                return df
+            df["_sev_rank"] = df["Severity"].map(lambda s: severity_rank(str(s)))
+            return df.sort_values(by=["_sev_rank", "Type"], ascending=[True, True]).drop(columns=["_sev_rank"])
+
+        return self._cached("report", build, snapshot=True)
+
+    def filter_index(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        (report_frame, index), aligned row for row. The index holds Severity/Type as categoricals and
+        one lowercased title/URL/target column for substring search, so filtering a rerun is a few
+        vectorized passes instead of re-lowercasing three columns. Built once per version.
+        """
+
+        def build() -> Tuple[pd.DataFrame, pd.DataFrame]:
+            df = self.report_frame()
+            search = df["Article Title"].fillna("").astype(str)
+            for col in ("Article URL", "Target URL"):
+                # \x1f keeps a query from matching across the end of one field and the start of the next.
+                search = search + "\x1f" + df[col].fillna("").astype(str)
+            index = pd.DataFrame(
+                {
+                    "Severity": df["Severity"].astype("category"),
+                    "Type": df["Type"].astype("category"),
+                    "search": search.str.lower(),
+                },
+                index=df.index,
+            )
+            return df, index
+
+        return self._cached("filter_index", build)
+
+    def finding_types(self, limit: Optional[int] = None) -> List[str]:
+        """Distinct Type values (of the first `limit` report rows), sorted."""
+        _, index = self.filter_index()
+        types = index["Type"].iloc[:limit].unique() if limit is not None else index["Type"].cat.categories
+        return sorted(str(t) for t in types)
+
+    def filter(
+        self, severities: List[str], types: List[str], query: str = "", limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Report rows (of the first `limit`) whose severity is in `severities`, whose type is in `types`
+        (any type if empty) and whose title/URL/target contains `query`, case-insensitively and literally.
+        """
+        df, index = self.filter_index()
+        if limit is not None:
+            df, index = df.iloc[:limit], index.iloc[:limit]
+        mask = None
+
+        def codes_in(col: str, values: List[str]) -> pd.Series:
+            cats = index[col].cat.categories
+            return index[col].cat.codes.isin([cats.get_loc(v) for v in values if v in cats])
+
+        if set(severities) != set(index["Severity"].cat.categories):
+            mask = codes_in("Severity", severities)
+        if types and set(types) != set(index["Type"].cat.categories):
+            m = codes_in("Type", types)
+            mask = m if mask is None else (mask & m)
+        q = (query or "").strip().lower()
+        if q:
+            # Search only the rows the severity/type filters kept.
+            search = index["search"] if mask is None else index["search"][mask]
+            hits = search.str.contains(q, regex=False)
+            mask = hits if mask is None else hits.reindex(index.index, fill_value=False)
+        return df if mask is None else df[mask]
+
+    def _cached(self, name: str, build, snapshot: bool = False) -> Any:
+        """
+        build() (or build(columns) with `snapshot`, a copy taken under the lock so a running scan can keep
+        appending) once per version.
+        """
+        with self._lock:
+            hit = self._frames.get(name)
+            if hit is not None and hit[0] == self.version:
+                return hit[1]
+            version = self.version
+            cols = {c: list(col) for c, col in self._cols.items()} if snapshot else None
+        df = build(cols) if snapshot else build()
+        with self._lock:
+            self._frames[name] = (version, df)
+        return df
+
 def ss_init():
     st.session_state.setdefault("scan_results", [])
-    st.session_state.setdefault("findings", [])
+    st.session_state.setdefault("findings", FindingsStore())
     st.session_state.setdefault("last_logs", [])
-    st.session_state.setdefault("url_cache", {})
     st.session_state.setdefault("scan_running", False)
     st.session_state.setdefault("last_scanned_title", "")
     st.session_state.setdefault("connected_ok", False)
+    st.session_state.setdefault("typo_cache_stats", {})
+    st.session_state.setdefault("scan_counters", new_scan_counters())
 
     # Diagnostics
     st.session_state.setdefault("scan_id", "")
+    st.session_state.setdefault("scan_reported", "")
     st.session_state.setdefault("scan_started_at", None)
 
     # Pro / Paywall state
@@ -443,6 +691,12 @@ def _hash_email(email: str) -> str:
         return ""
     return hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()[:16]
 
+def scan_owner_key(subdomain: str, email: str) -> str:
+    """Who may see a scan: the Zendesk account (subdomain + admin email) that started it. "" if not connected."""
+    if not subdomain or not email:
+        return ""
+    return hashlib.sha256(f"{subdomain.strip().lower()}\n{email.strip().lower()}".encode("utf-8")).hexdigest()[:32]
+
 def _safe_domain(email: str) -> str:
     try:
         e = (email or "").strip().lower()
@@ -452,6 +706,14 @@ def _safe_domain(email: str) -> str:
         pass
     return ""
 
+def process_rss_kb() -> Optional[int]:
+    """Current resident set size of this process in KiB (Linux /proc), or None where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * (os.sysconf("SC_PAGE_SIZE") // 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
 def log_event(event: str, scan_id: str, **fields):
     payload = {
         "event": event,
@@ -490,6 +752,736 @@ class timed_phase:
             log_event("scan_phase_ok", self.scan_id, phase=self.phase, elapsed_ms=elapsed_ms, **self.base_fields)
         return False
 
+# =========================
+# 3c) LOCAL STORAGE
+# =========================
+def sqlite_connect(filename: str) -> sqlite3.Connection:
+    """
+    Opens a SQLite database under CACHE_DIR.
+    WAL mode lets several processes read while one writes; callers serialize their own threads.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(CACHE_DIR, filename), timeout=30, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def _strip_query_param(segment: str) -> bool:
+    name = unquote(segment.split("=", 1)[0]).lower()
+    return any(name.startswith(p[:-1]) if p.endswith("*") else name == p for p in LINK_CHECK_STRIP_PARAMS)
+
+def url_cache_key(url: str) -> str:
+    """
+    Canonical form of a URL, used for probing and as the cache key: scheme/host lower-cased,
+    default port dropped, empty path as '/', fragment and LINK_CHECK_STRIP_PARAMS query params removed.
+    Credentials (user:password@) are dropped too, so they never reach the persistent cache or a redirect chain.
+    Scheme and trailing slashes are kept as-is; those variants are tied together by following redirects.
+    """
+    p = urlsplit((url or "").strip())
+    scheme = p.scheme.lower()
+    netloc = p.netloc.rpartition("@")[2].lower()
+    try:
+        host, port = p.hostname, p.port
+    except ValueError:
+        host, port = None, None
+    if host:
+        netloc = f"[{host}]" if ":" in host else host
+        if port is not None and (scheme, port) not in (("http", 80), ("https", 443)):
+            netloc = f"{netloc}:{port}"
+    query = "&".join(seg for seg in p.query.split("&") if seg and not _strip_query_param(seg))
+    return urlunsplit((scheme, netloc, p.path or "/", query, ""))
+
+class UrlStatusCache:
+    """
+    Persistent URL -> check result cache with separate TTLs for OK and failed/inconclusive results.
+    Least-recently-used rows are evicted once the table grows past `max_entries`.
+    """
+
+    def __init__(
+        self,
+        filename: str = "url_status.sqlite3",
+        ttl_ok_s: int = URL_CACHE_TTL_OK_S,
+        ttl_fail_s: int = URL_CACHE_TTL_FAIL_S,
+        max_entries: int = URL_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_ok_s = ttl_ok_s
+        self.ttl_fail_s = ttl_fail_s
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self._conn = sqlite_connect(filename)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS url_status ("
+            " key TEXT PRIMARY KEY, result TEXT NOT NULL, ok INTEGER,"
+            " checked_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS url_status_last_used ON url_status(last_used)")
+
+    def _fresh(self, ok: Optional[int], checked_at: float, now: float) -> bool:
+        ttl = self.ttl_ok_s if ok == 1 else self.ttl_fail_s
+        return (now - checked_at) < ttl
+
+    def get_many(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Returns url -> result for every URL with an unexpired entry."""
+        keys = {url_cache_key(u): u for u in urls}
+        if not keys:
+            return {}
+        now = time.time()
+        found: Dict[str, Dict[str, Any]] = {}
+        try:
+            with self._lock:
+                key_list = list(keys)
+                for i in range(0, len(key_list), 500):
+                    chunk = key_list[i : i + 500]
+                    rows = self._conn.execute(
+                        f"SELECT key, result, ok, checked_at FROM url_status WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    hits = [(k, r) for k, r, ok, checked_at in rows if self._fresh(ok, checked_at, now)]
+                    for k, r in hits:
+                        found[keys[k]] = json.loads(r)
+                    if hits:
+                        self._conn.executemany(
+                            "UPDATE url_status SET last_used = ? WHERE key = ?", [(now, k) for k, _r in hits]
+                        )
+        except sqlite3.Error as e:
+            logger.warning(f"url cache read failed: {e}")
+            return {}
+        return found
+
+    def put_many(self, results: Dict[str, Dict[str, Any]]) -> None:
+        if not results:
+            return
+        now = time.time()
+        rows = []
+        for u, res in results.items():
+            ok = res.get("ok")
+            rows.append((url_cache_key(u), json.dumps(res), None if ok is None else int(bool(ok)), now, now))
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO url_status (key, result, ok, checked_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._writes_since_evict += len(rows)
+                if self._writes_since_evict >= 1000:
+                    self._writes_since_evict = 0
+                    self._evict()
+        except sqlite3.Error as e:
+            logger.warning(f"url cache write failed: {e}")
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM url_status").fetchone()
+        if count <= self.max_entries:
+            return
+        # Trim to 90% so eviction doesn't run on every subsequent write.
+        excess = count - int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM url_status WHERE key IN (SELECT key FROM url_status ORDER BY last_used ASC LIMIT ?)",
+            (excess,),
+        )
+
+def server_process_id() -> str:
+    """
+    "host:pid:start" for this server process: the same across reruns and cache clears, different after a
+    restart even when the pid is reused (e.g. pid 1 in a container). Kept in the environment, which
+    survives Streamlit re-executing this script; forked children see a different pid and make their own.
+    """
+    pid = os.getpid()
+    current = os.environ.get("ZENAUDIT_PROCESS_ID", "")
+    if current.split(":")[1:2] != [str(pid)]:
+        current = f"{socket.gethostname()}:{pid}:{time.time():.6f}"
+        os.environ["ZENAUDIT_PROCESS_ID"] = current
+    return current
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+class ScanJobStore:
+    """
+    Status and progress of background scans, one row per scan_id, so a page reopened after the server
+    restarted can tell what happened to its scan. Each row records the server process that runs it; a
+    queued/running row whose process is gone (see owner_gone) is reported and saved as 'interrupted'.
+    Rows of live processes are left alone, so reopening the store or a second server sharing CACHE_DIR
+    never marks a running scan as resumable.
+    """
+
+    def __init__(
+        self, filename: str = "scan_jobs.sqlite3", retention_s: int = 30 * 86400, stale_s: int = SCAN_JOB_STALE_S
+    ):
+        self._lock = threading.Lock()
+        self.owner = server_process_id()
+        self.stale_s = stale_s
+        self._conn = sqlite_connect(filename)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scan_jobs ("
+            " scan_id TEXT PRIMARY KEY, subdomain TEXT NOT NULL, status TEXT NOT NULL,"
+            " scanned INTEGER NOT NULL, findings INTEGER NOT NULL, error TEXT NOT NULL,"
+            " started_at REAL NOT NULL, updated_at REAL NOT NULL, owner TEXT NOT NULL DEFAULT '')"
+        )
+        cols = {row[1] for row in self._conn.execute("PRAGMA table_info(scan_jobs)")}
+        if "owner" not in cols:
+            self._conn.execute("ALTER TABLE scan_jobs ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+        self._conn.execute("DELETE FROM scan_jobs WHERE updated_at < ?", (time.time() - retention_s,))
+        rows = self._conn.execute(
+            "SELECT scan_id, owner, updated_at FROM scan_jobs WHERE status IN ('queued', 'running')"
+        ).fetchall()
+        gone = [(scan_id,) for scan_id, owner, updated_at in rows if self.owner_gone(owner, updated_at)]
+        if gone:
+            self._conn.executemany("UPDATE scan_jobs SET status = 'interrupted' WHERE scan_id = ?", gone)
+
+    def owner_gone(self, owner: str, updated_at: float) -> bool:
+        """Whether the process that owns a queued/running row can no longer be running it."""
+        if owner == self.owner:
+            return False
+        host, _, rest = owner.partition(":")
+        pid = rest.partition(":")[0]
+        if not owner or not pid.isdigit():
+            # Written before owners were recorded.
+            return True
+        if host == socket.gethostname():
+            # Same pid but a different start: an earlier process that reused the pid (e.g. after a restart).
+            return int(pid) == os.getpid() or not _pid_alive(int(pid))
+        return time.time() - updated_at > self.stale_s
+
+    def put(self, scan_id: str, subdomain: str, status: str, scanned: int, findings: int, error: str = "") -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO scan_jobs"
+                    " (scan_id, subdomain, status, scanned, findings, error, started_at, updated_at, owner)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT(scan_id) DO UPDATE SET status = excluded.status, scanned = excluded.scanned,"
+                    " findings = excluded.findings, error = excluded.error, updated_at = excluded.updated_at,"
+                    " owner = excluded.owner",
+                    (scan_id, subdomain, status, int(scanned), int(findings), error or "", now, now, self.owner),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"scan job store write failed: {e}")
+
+    def get(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT subdomain, status, scanned, findings, error, owner, updated_at FROM scan_jobs"
+                    " WHERE scan_id = ?",
+                    (scan_id,),
+                ).fetchone()
+                if row is not None and row[1] in ("queued", "running") and self.owner_gone(row[5], row[6]):
+                    self._conn.execute("UPDATE scan_jobs SET status = 'interrupted' WHERE scan_id = ?", (scan_id,))
+                    row = (row[0], "interrupted", *row[2:])
+        except sqlite3.Error as e:
+            logger.warning(f"scan job store read failed: {e}")
+            return None
+        if row is None:
+            return None
+        subdomain, status, scanned, findings, error = row[:5]
+        return {"subdomain": subdomain, "status": status, "scanned": scanned, "findings": findings, "error": error}
+
+class ScanCheckpointStore:
+    """
+    Per-page scan checkpoints keyed by scan_id: the next listing page plus everything produced so far
+    (results, findings, articles waiting on internal links, listed ids, URL checks), so a failed scan
+    resumes from its last completed page. Credentials are never stored; a resume uses the current ones.
+    """
+
+    def __init__(self, filename: str = "scan_checkpoints.sqlite3", retention_s: int = 7 * 86400):
+        self._lock = threading.Lock()
+        self._conn = sqlite_connect(filename)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scan_checkpoints ("
+            " scan_id TEXT PRIMARY KEY, subdomain TEXT NOT NULL, options TEXT NOT NULL, next_url TEXT,"
+            " listing_done INTEGER NOT NULL, listing_complete INTEGER NOT NULL, pages INTEGER NOT NULL,"
+            " scanned INTEGER NOT NULL, reused INTEGER NOT NULL, internal_resolved INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scan_checkpoint_pages ("
+            " scan_id TEXT NOT NULL, page_no INTEGER NOT NULL, payload TEXT NOT NULL,"
+            " PRIMARY KEY (scan_id, page_no))"
+        )
+        cutoff = time.time() - retention_s
+        self._conn.execute(
+            "DELETE FROM scan_checkpoint_pages WHERE scan_id IN (SELECT scan_id FROM scan_checkpoints WHERE updated_at < ?)",
+            (cutoff,),
+        )
+        self._conn.execute("DELETE FROM scan_checkpoints WHERE updated_at < ?", (cutoff,))
+
+    def begin(self, scan_id: str, subdomain: str, options: Dict[str, Any]) -> None:
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO scan_checkpoints"
+                    " (scan_id, subdomain, options, next_url, listing_done, listing_complete, pages,"
+                    "  scanned, reused, internal_resolved, updated_at)"
+                    " VALUES (?, ?, ?, NULL, 0, 1, 0, 0, 0, 0, ?)",
+                    (scan_id, subdomain, json.dumps(options), time.time()),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"checkpoint write failed: {e}")
+
+    def save_page(
+        self,
+        scan_id: str,
+        page_no: int,
+        payload: Dict[str, Any],
+        next_url: Optional[str],
+        listing_complete: bool,
+        scanned: int,
+        reused: int,
+        internal_resolved: int,
+    ) -> None:
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO scan_checkpoint_pages (scan_id, page_no, payload) VALUES (?, ?, ?)",
+                        (scan_id, page_no, json.dumps(payload)),
+                    )
+                    self._conn.execute(
+                        "UPDATE scan_checkpoints SET next_url = ?, listing_done = ?, listing_complete = ?, pages = ?,"
+                        " scanned = ?, reused = ?, internal_resolved = ?, updated_at = ? WHERE scan_id = ?",
+                        (
+                            next_url,
+                            int(next_url is None),
+                            int(listing_complete),
+                            page_no + 1,
+                            scanned,
+                            reused,
+                            internal_resolved,
+                            time.time(),
+                            scan_id,
+                        ),
+                    )
+                except sqlite3.Error:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.warning(f"checkpoint write failed: {e}")
+
+    def progress(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        """Checkpoint summary (subdomain, pages, scanned) without the page payloads, or None."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT subdomain, pages, scanned FROM scan_checkpoints WHERE scan_id = ?", (scan_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"checkpoint read failed: {e}")
+            return None
+        if row is None:
+            return None
+        return {"subdomain": row[0], "pages": row[1], "scanned": row[2]}
+
+    def load(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        """Everything needed to resume `scan_id`, with the page payloads merged in page order; None if unknown."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT subdomain, options, next_url, listing_done, listing_complete, pages,"
+                    " scanned, reused, internal_resolved FROM scan_checkpoints WHERE scan_id = ?",
+                    (scan_id,),
+                ).fetchone()
+                pages = self._conn.execute(
+                    "SELECT payload FROM scan_checkpoint_pages WHERE scan_id = ? ORDER BY page_no", (scan_id,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"checkpoint read failed: {e}")
+            return None
+        if row is None:
+            return None
+        subdomain, options, next_url, listing_done, listing_complete, n_pages, scanned, reused, internal_resolved = row
+        out: Dict[str, Any] = {
+            "subdomain": subdomain,
+            "options": json.loads(options),
+            "next_url": next_url,
+            "listing_done": bool(listing_done),
+            "listing_complete": bool(listing_complete),
+            "pages": n_pages,
+            "scanned": scanned,
+            "reused": reused,
+            "internal_resolved": internal_resolved,
+            "results": [],
+            "findings": [],
+            "deferred": [],
+            "index": [],
+            "url_cache": {},
+        }
+        for (payload,) in pages:
+            page = json.loads(payload)
+            for key in ("results", "findings", "deferred", "index"):
+                out[key].extend(page[key])
+            out["url_cache"].update(page["url_cache"])
+        return out
+
+    def forget(self, scan_id: str) -> None:
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM scan_checkpoint_pages WHERE scan_id = ?", (scan_id,))
+                self._conn.execute("DELETE FROM scan_checkpoints WHERE scan_id = ?", (scan_id,))
+        except sqlite3.Error as e:
+            logger.warning(f"checkpoint delete failed: {e}")
+
+@st.cache_resource(show_spinner=False)
+def get_scan_checkpoint_store() -> Optional[ScanCheckpointStore]:
+    try:
+        return ScanCheckpointStore()
+    except (sqlite3.Error, OSError) as e:
+        log_event("scan_checkpoint_store_unavailable", "", error_message_short=str(e)[:300])
+        return None
+
+@st.cache_resource(show_spinner=False)
+def get_scan_job_store() -> Optional[ScanJobStore]:
+    try:
+        return ScanJobStore()
+    except (sqlite3.Error, OSError) as e:
+        log_event("scan_job_store_unavailable", "", error_message_short=str(e)[:300])
+        return None
+
+@st.cache_resource(show_spinner=False)
+def get_url_status_cache() -> Optional[UrlStatusCache]:
+    try:
+        return UrlStatusCache()
+    except (sqlite3.Error, OSError) as e:
+        log_event("url_cache_unavailable", "", error_message_short=str(e)[:300])
+        return None
+
+def allow_list_version(allow: FrozenSet[str]) -> str:
+    """Short fingerprint of a KB's allow-list; typo counts are only reusable under the same one."""
+    return hashlib.sha1("\n".join(sorted(allow)).encode("utf-8")).hexdigest()[:16]
+
+class ArticleResultStore:
+    """
+    Per-article content analysis (typo count, alt count, links, images) keyed by (subdomain, article id),
+    stored with the article's `updated_at` and the allow-list version its typo count was computed against.
+    Rows from an older ANALYSIS_VERSION are ignored.
+    """
+
+    def __init__(self, filename: str = "articles.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = sqlite_connect(filename)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS article_results ("
+            " subdomain TEXT NOT NULL, article_id INTEGER NOT NULL, updated_at TEXT NOT NULL,"
+            " version INTEGER NOT NULL, analysis TEXT NOT NULL, saved_at REAL NOT NULL,"
+            " allow_version TEXT NOT NULL DEFAULT '',"
+            " PRIMARY KEY (subdomain, article_id))"
+        )
+        cols = {row[1] for row in self._conn.execute("PRAGMA table_info(article_results)")}
+        if "allow_version" not in cols:
+            # Stores written before allow-list versioning: their rows match no version and get recomputed.
+            self._conn.execute("ALTER TABLE article_results ADD COLUMN allow_version TEXT NOT NULL DEFAULT ''")
+
+    def get_many(
+        self, subdomain: str, article_ids: List[Any], allow_version: Optional[str] = None
+    ) -> Dict[Any, Tuple[str, Dict[str, Any]]]:
+        """
+        Returns article_id -> (updated_at, analysis) for stored, current-version rows
+        (computed against `allow_version`, unless it is None).
+        """
+        ids = [i for i in article_ids if i is not None]
+        if not ids:
+            return {}
+        where = "subdomain = ? AND version = ?"
+        params: List[Any] = [subdomain, ANALYSIS_VERSION]
+        if allow_version is not None:
+            where += " AND allow_version = ?"
+            params.append(allow_version)
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT article_id, updated_at, analysis FROM article_results"
+                    f" WHERE {where} AND article_id IN ({','.join('?' * len(ids))})",
+                    [*params, *ids],
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"article store read failed: {e}")
+            return {}
+        return {aid: (updated_at, json.loads(analysis)) for aid, updated_at, analysis in rows}
+
+    def put_many(self, subdomain: str, rows: List[Tuple[Any, str, Dict[str, Any]]], allow_version: str = "") -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO article_results"
+                    " (subdomain, article_id, updated_at, version, analysis, saved_at, allow_version)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (subdomain, aid, updated_at, ANALYSIS_VERSION, json.dumps(analysis), now, allow_version)
+                        for aid, updated_at, analysis in rows
+                        if aid is not None
+                    ],
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"article store write failed: {e}")
+
+    def forget(self, subdomain: str) -> None:
+        """Drops stored results for a KB (e.g. after its custom dictionary changed)."""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM article_results WHERE subdomain = ?", (subdomain,))
+        except sqlite3.Error as e:
+            logger.warning(f"article store write failed: {e}")
+
+@st.cache_resource(show_spinner=False)
+def get_article_result_store() -> Optional[ArticleResultStore]:
+    try:
+        return ArticleResultStore()
+    except (sqlite3.Error, OSError) as e:
+        log_event("article_store_unavailable", "", error_message_short=str(e)[:300])
+        return None
+
+class VocabularyStore:
+    """
+    Per-subdomain spelling vocabulary:
+    - word_verdicts: spellchecker verdicts (word -> known), so later scans start with a warm cache
+    - custom_words: the KB's allow-list (uploaded word lists + terms learned from titles/labels)
+    """
+
+    def __init__(self, filename: str = "vocabulary.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = sqlite_connect(filename)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS word_verdicts ("
+            " subdomain TEXT NOT NULL, word TEXT NOT NULL, known INTEGER NOT NULL,"
+            " PRIMARY KEY (subdomain, word))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS custom_words ("
+            " subdomain TEXT NOT NULL, word TEXT NOT NULL, source TEXT NOT NULL,"
+            " PRIMARY KEY (subdomain, word))"
+        )
+
+    def load_allow_list(self, subdomain: str) -> FrozenSet[str]:
+        try:
+            with self._lock:
+                rows = self._conn.execute("SELECT word FROM custom_words WHERE subdomain = ?", (subdomain,)).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"vocabulary read failed: {e}")
+            return frozenset()
+        return frozenset(w for (w,) in rows)
+
+    def add_words(self, subdomain: str, words: set, source: str) -> int:
+        """Adds words to the allow-list (existing entries keep their source). Returns how many were new."""
+        if not words:
+            return 0
+        try:
+            with self._lock:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO custom_words (subdomain, word, source) VALUES (?, ?, ?)",
+                    [(subdomain, w, source) for w in words],
+                )
+                return self._conn.total_changes - before
+        except sqlite3.Error as e:
+            logger.warning(f"vocabulary write failed: {e}")
+            return 0
+
+    def count_words(self, subdomain: str) -> Dict[str, int]:
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT source, COUNT(*) FROM custom_words WHERE subdomain = ? GROUP BY source", (subdomain,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"vocabulary read failed: {e}")
+            return {}
+        return {src: n for src, n in rows}
+
+    def clear_words(self, subdomain: str) -> None:
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM custom_words WHERE subdomain = ?", (subdomain,))
+        except sqlite3.Error as e:
+            logger.warning(f"vocabulary write failed: {e}")
+
+    def load(self, subdomain: str) -> Dict[str, bool]:
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT word, known FROM word_verdicts WHERE subdomain = ?", (subdomain,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"vocabulary read failed: {e}")
+            return {}
+        return {w: bool(k) for w, k in rows}
+
+    def save(self, subdomain: str, verdicts: Dict[str, bool]) -> None:
+        if not verdicts:
+            return
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO word_verdicts (subdomain, word, known) VALUES (?, ?, ?)",
+                    [(subdomain, w, int(v)) for w, v in verdicts.items()],
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"vocabulary write failed: {e}")
+
+@st.cache_resource(show_spinner=False)
+def get_vocabulary_store() -> Optional[VocabularyStore]:
+    try:
+        return VocabularyStore()
+    except (sqlite3.Error, OSError) as e:
+        log_event("vocabulary_store_unavailable", "", error_message_short=str(e)[:300])
+        return None
+
+# =========================
+# 3d) HTTP CLIENTS
+# =========================
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that counts requests sent and TCP/TLS connections opened,
+    so connection reuse (requests - connections) can be checked.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "connections": 0}
+        super().__init__(*args, **kwargs)
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        adapter = self
+
+        def counting(base):
+            class CountingPool(base):
+                def _new_conn(self):
+                    adapter._count("connections")
+                    return super()._new_conn()
+
+            return CountingPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": counting(HTTPConnectionPool),
+            "https": counting(HTTPSConnectionPool),
+        }
+
+    def send(self, request, **kwargs):
+        self._count("requests")
+        return super().send(request, **kwargs)
+
+@st.cache_resource(show_spinner=False)
+def get_http_session(kind: str) -> requests.Session:
+    """
+    Process-wide keep-alive session per traffic kind ("zendesk", "probe", "worker"), shared across threads and users.
+    Cookies are never stored: one user's Zendesk/site cookies must not ride along on another user's requests.
+    """
+    pool_hosts, pool_size = HTTP_POOLS[kind]
+    sess = requests.Session()
+    sess.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = PooledHTTPAdapter(
+        pool_connections=pool_hosts,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=HTTP_CONNECT_RETRIES,
+            connect=HTTP_CONNECT_RETRIES,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=0.3,
+            raise_on_status=False,
+        ),
+    )
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
+
+def http_pool_stats(sessions: Optional[Dict[str, requests.Session]] = None) -> Dict[str, Dict[str, int]]:
+    out: Dict[str, Dict[str, int]] = {}
+    for kind in HTTP_POOLS:
+        sess = sessions[kind] if sessions is not None else get_http_session(kind)
+        adapter = sess.get_adapter("https://")
+        stats = dict(getattr(adapter, "stats", {}) or {})
+        if stats:
+            stats["reused"] = max(0, stats["requests"] - stats["connections"])
+        out[kind] = stats
+    return out
+
+def zendesk_rate_limit_wait(resp: requests.Response) -> Optional[float]:
+    """Seconds the API asks us to wait: Retry-After, else the rate-limit reset when no requests remain."""
+    wait = parse_retry_after(resp.headers.get("Retry-After"))
+    if wait is not None:
+        return wait
+    remaining = resp.headers.get("ratelimit-remaining") or resp.headers.get("x-rate-limit-remaining")
+    reset = resp.headers.get("ratelimit-reset")
+    if (resp.status_code == 429 or (remaining or "").strip() == "0") and (reset or "").strip().isdigit():
+        return float(reset)
+    return None
+
+def zendesk_get(
+    sess: requests.Session,
+    url: str,
+    auth: Tuple[str, str],
+    scan_id: str = "",
+    budget_s: float = ZENDESK_RETRY_BUDGET_S,
+) -> requests.Response:
+    """
+    GET against the Zendesk API with retries on 429/5xx, timeouts and connection errors.
+    Waits what Retry-After/ratelimit-reset asks for, else full-jitter exponential backoff; stops after
+    ZENDESK_RETRY_MAX_ATTEMPTS or once the next wait would overrun `budget_s`, returning the last response
+    (or re-raising the last error). A successful response with no requests left waits out the reset first.
+    """
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        resp: Optional[requests.Response] = None
+        error: Optional[requests.RequestException] = None
+        try:
+            resp = sess.get(url, auth=auth, timeout=REQUEST_TIMEOUT)
+        except (requests.Timeout, requests.ConnectionError) as e:
+            error = e
+
+        if resp is not None and resp.status_code not in ZENDESK_RETRY_STATUSES:
+            pause = zendesk_rate_limit_wait(resp)
+            if pause:
+                pause = min(pause, ZENDESK_RETRY_MAX_DELAY_S)
+                log_event("zendesk_rate_limit_pause", scan_id, delay_ms=int(pause * 1000), page_url=url[:200])
+                time.sleep(pause)
+            return resp
+
+        hinted = zendesk_rate_limit_wait(resp) if resp is not None else None
+        if hinted is not None:
+            delay = min(hinted, ZENDESK_RETRY_MAX_DELAY_S) + random.uniform(0, 0.5)
+        else:
+            delay = random.uniform(0, min(ZENDESK_RETRY_MAX_DELAY_S, ZENDESK_RETRY_BASE_S * 2 ** (attempt - 1)))
+        elapsed = time.monotonic() - started
+        reason = {"http_status": resp.status_code} if resp is not None else {"error_type": error.__class__.__name__}
+
+        if attempt >= ZENDESK_RETRY_MAX_ATTEMPTS or elapsed + delay > budget_s:
+            log_event(
+                "zendesk_retry_gave_up", scan_id, attempts=attempt, elapsed_ms=int(elapsed * 1000), page_url=url[:200], **reason
+            )
+            if resp is not None:
+                return resp
+            raise error
+
+        log_event(
+            "zendesk_retry",
+            scan_id,
+            attempt=attempt,
+            delay_ms=int(delay * 1000),
+            retry_after_s=hinted,
+            page_url=url[:200],
+            **reason,
+        )
+        time.sleep(delay)
+
 # =========================
 # 4) INPUT + UI HELPERS
 # =========================
@@ -540,7 +1532,7 @@ def verify_zendesk_connection(subdomain: str, email: str, token: str) -> Tuple[b
 
     try:
         test_url = f"{base_url}/api/v2/help_center/articles.json?per_page=1"
-        r = requests.get(test_url, auth=auth, timeout=REQUEST_TIMEOUT)
+        r = zendesk_get(get_http_session("zendesk"), test_url, auth, budget_s=REQUEST_TIMEOUT)
 
         if r.status_code == 200:
             return True, "✅ Connected to Zendesk"
@@ -568,95 +1560,681 @@ def safe_parse_updated_at(s: str) -> Optional[datetime]:
     except Exception:
         return None
 
-def normalize_url(base_url: str, raw: Optional[str]) -> Optional[str]:
-    if not raw:
+URL_CHECK_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/121.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header (delta-seconds or HTTP-date) -> seconds from now, or None."""
+    if not value:
         return None
-    raw = raw.strip()
-    if raw.startswith(("mailto:", "tel:", "javascript:")):
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
         return None
-    if raw.startswith("#"):
+    if when is None:
         return None
-    return urljoin(base_url, raw)
-
-def extract_links_images(html: str, base_url: str) -> Tuple[BeautifulSoup, str, List[str], List[Dict[str, Any]]]:
-    soup = BeautifulSoup(html or "", "html.parser")
-
-    links: List[str] = []
-    for a in soup.find_all("a"):
-        u = normalize_url(base_url, a.get("href"))
-        if u:
-            links.append(u)
-
-    images: List[Dict[str, Any]] = []
-    for img in soup.find_all("img"):
-        u = normalize_url(base_url, img.get("src"))
-        if u:
-            images.append({"src": u, "missing_alt": not bool((img.get("alt") or "").strip())})
-
-    text = soup.get_text(" ", strip=True)
-    return soup, text, links, images
-
-def check_url_status(url: str, timeout: int = 8) -> Dict[str, Any]:
-    cache = st.session_state.url_cache
-    if url in cache:
-        return cache[url]
-
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/121.0 Safari/537.36"
-        ),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    }
+    return max(0.0, when.timestamp() - time.time())
 
-    try:
-        resp = requests.head(url, allow_redirects=True, timeout=timeout, headers=headers)
-        status = resp.status_code
+def url_host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
 
-        if status in (403, 405) or status >= 400:
-            resp = requests.get(url, allow_redirects=True, timeout=timeout, headers=headers)
-            status = resp.status_code
+class HeadSupportMemory:
+    """
+    Remembers, per host, whether HEAD answers can be trusted. Hosts that reject HEAD (405/501)
+    or fail it while a GET succeeds are probed with a ranged GET straight away next time.
+    """
 
+    def __init__(self, max_hosts: int = 10_000):
+        self.max_hosts = max_hosts
+        self._lock = threading.Lock()
+        self._hosts: "OrderedDict[str, bool]" = OrderedDict()
+
+    def supports_head(self, host: str) -> Optional[bool]:
+        with self._lock:
+            return self._hosts.get(host)
+
+    def remember(self, host: str, supported: bool) -> None:
+        with self._lock:
+            self._hosts[host] = supported
+            self._hosts.move_to_end(host)
+            while len(self._hosts) > self.max_hosts:
+                self._hosts.popitem(last=False)
+
+@st.cache_resource(show_spinner=False)
+def get_head_support_memory() -> HeadSupportMemory:
+    return HeadSupportMemory()
+
+def _ranged_get(url: str, sess: requests.Session, timeout: int, follow_redirects: bool = False) -> requests.Response:
+    """GET asking for the first byte only; the body is never read and the connection is closed right away."""
+    resp = sess.get(
+        url,
+        allow_redirects=follow_redirects,
+        timeout=timeout,
+        headers={**URL_CHECK_HEADERS, "Range": "bytes=0-0"},
+        stream=True,
+    )
+    resp.close()
+    return resp
+
+def probe_url_status(
+    url: str,
+    sess: requests.Session,
+    head_memory: HeadSupportMemory,
+    timeout: int = LINK_CHECK_TIMEOUT,
+    follow_redirects: bool = False,
+) -> Dict[str, Any]:
+    """
+    Probes a single URL over HTTP (one hop, redirects are not followed) and classifies the outcome.
+    HEAD first (unless the host is known not to support it), then a streamed `Range: bytes=0-0` GET,
+    so a large image/PDF is never downloaded just to read its status.
+    No caching and no Streamlit state, so it is safe to call from worker threads.
+    429/503 results carry an internal "retry_after" (seconds or None) for the scheduler;
+    redirects carry an internal "location" for check_urls_concurrent to follow.
+    With `follow_redirects`, requests follows the whole chain instead, carrying cookies set along the way
+    (the session itself keeps none); check_urls_concurrent uses it to confirm an apparent redirect loop.
+    """
+    host = url_host(url)
+    try:
+        head_status = None
+        if head_memory.supports_head(host) is not False:
+            resp = sess.head(url, allow_redirects=follow_redirects, timeout=timeout, headers=URL_CHECK_HEADERS)
+            head_status = status = resp.status_code
+            if status in (405, 501):
+                head_memory.remember(host, False)
+            elif status < 400:
+                head_memory.remember(host, True)
+
+        # Rate limited: don't hit the host again with a GET right away.
+        if head_status is None or (head_status != 429 and head_status >= 400):
+            resp = _ranged_get(url, sess, timeout, follow_redirects=follow_redirects)
+            status = resp.status_code
+            if status == 416:
+                # Range not satisfiable: the resource exists (it's just empty).
+                status = 200
+            if head_status is not None and head_status >= 400 and status < 400:
+                head_memory.remember(host, False)
+
+        location = resp.headers.get("Location") if resp.is_redirect else None
+        if location:
+            return {"ok": None, "status": status, "kind": "redirect", "severity": "info", "location": location}
         if status in (404, 410):
-            result = {"ok": False, "status": status, "kind": "not_found", "severity": "critical"}
-        elif status >= 500:
+            return {"ok": False, "status": status, "kind": "not_found", "severity": "critical"}
+        if status >= 500:
             result = {"ok": False, "status": status, "kind": "server_error", "severity": "warning"}
         elif status in (401, 403, 429):
             result = {"ok": None, "status": status, "kind": "blocked_or_rate_limited", "severity": "info"}
         elif status >= 400:
-            result = {"ok": False, "status": status, "kind": "client_error", "severity": "warning"}
+            return {"ok": False, "status": status, "kind": "client_error", "severity": "warning"}
         else:
-            result = {"ok": True, "status": status, "kind": None, "severity": "info"}
+            return {"ok": True, "status": status, "kind": None, "severity": "info"}
 
+        if status in (429, 503):
+            result["retry_after"] = parse_retry_after(resp.headers.get("Retry-After"))
+        return result
+
+    except requests.TooManyRedirects:
+        return {"ok": False, "status": None, "kind": "redirect_loop", "severity": "warning"}
     except requests.Timeout:
-        result = {"ok": False, "status": None, "kind": "timeout", "severity": "warning"}
+        return {"ok": False, "status": None, "kind": "timeout", "severity": "warning"}
     except requests.RequestException:
-        result = {"ok": False, "status": None, "kind": "request_error", "severity": "warning"}
+        return {"ok": False, "status": None, "kind": "request_error", "severity": "warning"}
+
+class HostLimiter:
+    """
+    Process-wide politeness state per host, shared by every scan on this server:
+    a token bucket (`rate` probes/second, up to `burst`), a cap on concurrent probes,
+    and a not-before time set when the host answers with Retry-After.
+    Idle hosts (bucket refilled, nothing in flight, no pending Retry-After) are dropped every
+    `sweep_interval_s`; a fresh bucket behaves the same, so memory stays bounded by recently seen hosts.
+    """
+
+    def __init__(self, rate: float, burst: int, max_concurrent: int, sweep_interval_s: float = 60.0):
+        self.rate = max(0.01, float(rate))
+        self.burst = max(1, int(burst))
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.sweep_interval_s = float(sweep_interval_s)
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, float]] = {}
+        self._last_sweep = time.monotonic()
+
+    def _bucket(self, host: str, now: float) -> Dict[str, float]:
+        # Called with `_lock` held.
+        h = self._hosts.get(host)
+        if h is None:
+            h = self._hosts[host] = {"tokens": float(self.burst), "ts": now, "active": 0, "not_before": 0.0}
+        return h
+
+    def _sweep(self, now: float) -> None:
+        # Called with `_lock` held.
+        self._last_sweep = now
+        full_after = self.burst / self.rate
+        for host in [
+            host
+            for host, h in self._hosts.items()
+            if h["active"] <= 0 and h["not_before"] <= now and (h["tokens"] >= self.burst or now - h["ts"] >= full_after)
+        ]:
+            del self._hosts[host]
+
+    def try_acquire(self, host: str) -> float:
+        """Takes a probe slot for `host` and returns 0, or returns how long to wait before asking again."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_sweep >= self.sweep_interval_s:
+                self._sweep(now)
+            h = self._bucket(host, now)
+            h["tokens"] = min(float(self.burst), h["tokens"] + (now - h["ts"]) * self.rate)
+            h["ts"] = now
+            if now < h["not_before"]:
+                return h["not_before"] - now
+            if h["active"] >= self.max_concurrent:
+                return 0.05
+            if h["tokens"] < 1:
+                return (1 - h["tokens"]) / self.rate
+            h["tokens"] -= 1
+            h["active"] += 1
+            return 0.0
+
+    def release(self, host: str) -> None:
+        with self._lock:
+            h = self._hosts.get(host)
+            if h is not None:
+                h["active"] = max(0, h["active"] - 1)
+
+    def defer(self, host: str, seconds: float) -> None:
+        with self._lock:
+            # The host may have been swept between release() and defer().
+            now = time.monotonic()
+            h = self._bucket(host, now)
+            h["not_before"] = max(h["not_before"], now + seconds)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._hosts)
+
+@st.cache_resource(show_spinner=False)
+def get_host_limiter() -> HostLimiter:
+    return HostLimiter(LINK_CHECK_HOST_RATE, LINK_CHECK_HOST_BURST, LINK_CHECK_HOST_CONCURRENCY)
+
+def probe_urls_politely(
+    urls: List[str],
+    timeout: int,
+    workers: int,
+    limiter: HostLimiter,
+    sess: requests.Session,
+    head_memory: HeadSupportMemory,
+    follow_redirects: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Probes `urls` on up to `workers` threads (`follow_redirects` is passed to probe_url_status). Each thread takes the next URL from the first host
+    (round-robin) that `limiter` lets through, so a slow or throttled host never blocks the others.
+    429 (and 503 with Retry-After) is retried up to LINK_CHECK_RATE_LIMIT_RETRIES times after
+    the host's Retry-After; waits longer than LINK_CHECK_RETRY_AFTER_MAX_S keep the inconclusive result.
+    """
+    queues: "OrderedDict[str, deque]" = OrderedDict()
+    for u in urls:
+        queues.setdefault(url_host(u), deque()).append((u, 0))
+
+    results: Dict[str, Dict[str, Any]] = {}
+    cond = threading.Condition()
+    in_flight = 0
+
+    def _next_task() -> Optional[Tuple[str, str, int]]:
+        # Called with `cond` held.
+        while True:
+            if not queues:
+                if not in_flight:
+                    return None
+                cond.wait(timeout=0.25)  # an in-flight probe may be re-queued
+                continue
+            wait = 0.25
+            for host in list(queues):
+                delay = limiter.try_acquire(host)
+                if delay <= 0:
+                    q = queues[host]
+                    u, attempt = q.popleft()
+                    if q:
+                        queues.move_to_end(host)
+                    else:
+                        del queues[host]
+                    return host, u, attempt
+                wait = min(wait, delay)
+            cond.wait(timeout=wait)
+
+    def _worker() -> None:
+        nonlocal in_flight
+        while True:
+            with cond:
+                task = _next_task()
+                if task is None:
+                    cond.notify_all()
+                    return
+                in_flight += 1
+            host, u, attempt = task
+            try:
+                res = probe_url_status(u, sess, head_memory, timeout=timeout, follow_redirects=follow_redirects)
+            except Exception as e:
+                # Not a RequestException (e.g. http.client.InvalidURL for control characters in the URL):
+                # record it like any other failed request so this probe still counts as finished.
+                logger.warning(f"link probe failed for {u}: {e}")
+                res = {"ok": False, "status": None, "kind": "request_error", "severity": "warning"}
+            finally:
+                limiter.release(host)
+
+            with cond:
+                # Always settle this probe, or the other workers would wait on `in_flight` forever.
+                in_flight -= 1
+                try:
+                    retry_after = res.pop("retry_after", None)
+                    retryable = res["status"] == 429 or (res["status"] == 503 and retry_after is not None)
+                    if (
+                        retryable
+                        and attempt < LINK_CHECK_RATE_LIMIT_RETRIES
+                        and (retry_after is None or retry_after <= LINK_CHECK_RETRY_AFTER_MAX_S)
+                    ):
+                        limiter.defer(host, retry_after if retry_after is not None else 2.0 * (attempt + 1))
+                        queues.setdefault(host, deque()).appendleft((u, attempt + 1))
+                    else:
+                        results[u] = res
+                finally:
+                    cond.notify_all()
+
+    n_workers = max(1, min(int(workers or 1), len(urls)))
+    if n_workers == 1:
+        _worker()
+    else:
+        with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="zenaudit-probe") as pool:
+            for fut in [pool.submit(_worker) for _ in range(n_workers)]:
+                fut.result()
+    return results
+
+def _resolve_redirect(
+    key: str, redirects: Dict[str, str], cache: Dict[str, Dict[str, Any]], hop_status: Dict[str, int]
+) -> Dict[str, Any]:
+    """Final result for a redirecting URL, with "chain" listing every hop after it."""
+    chain: List[str] = []
+    seen = {key}
+    cur = key
+    while cur in redirects:
+        cur = redirects[cur]
+        chain.append(cur)
+        if cur in seen:
+            return {"ok": False, "status": hop_status[key], "kind": "redirect_loop", "severity": "warning", "chain": chain}
+        seen.add(cur)
+    final = cache.get(cur)
+    if final is not None:
+        chain += final.get("chain", [])
+    if final is None or len(chain) > LINK_CHECK_MAX_REDIRECTS:
+        return {"ok": False, "status": hop_status[key], "kind": "too_many_redirects", "severity": "warning", "chain": chain}
+    return {**final, "chain": chain}
+
+def check_urls_concurrent(
+    urls: List[str],
+    cache: Dict[str, Dict[str, Any]],
+    timeout: int = LINK_CHECK_TIMEOUT,
+    workers: int = LINK_CHECK_WORKERS,
+    store: Optional[UrlStatusCache] = None,
+    limiter: Optional[HostLimiter] = None,
+    sess: Optional[requests.Session] = None,
+    head_memory: Optional[HeadSupportMemory] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Checks many URLs with at most `workers` probes in flight, within the per-host limits.
+    URLs are canonicalized (url_cache_key) and deduped; anything in the scan's `cache` (keyed by canonical URL)
+    or fresh in the persistent `store` is not probed again.
+    Redirects are followed one hop per round, and a hop that is already known ends its chain without a request,
+    so many links redirecting to one destination check it once. Every hop is cached; results for redirected
+    URLs carry "chain" (the hops after the URL, ending at the final destination).
+    `cache` is filled from this (calling) thread only; returns url -> result for every input URL.
+    Background scans pass `limiter`/`sess`/`head_memory` in; the script thread can leave them to the shared getters.
+    """
+    limiter = limiter if limiter is not None else get_host_limiter()
+    sess = sess if sess is not None else get_http_session("probe")
+    head_memory = head_memory if head_memory is not None else get_head_support_memory()
+    keys = {u: url_cache_key(u) for u in urls}
+    pending = [k for k in dict.fromkeys(keys.values()) if k not in cache]
+    redirects: Dict[str, str] = {}
+    hop_status: Dict[str, int] = {}
+    fresh: Dict[str, Dict[str, Any]] = {}
+
+    for _hop in range(LINK_CHECK_MAX_REDIRECTS + 1):
+        if pending and store is not None:
+            stored = store.get_many(pending)
+            cache.update(stored)
+            pending = [k for k in pending if k not in stored]
+        if not pending:
+            break
+        probed = probe_urls_politely(
+            pending,
+            timeout=timeout,
+            workers=workers,
+            limiter=limiter,
+            sess=sess,
+            head_memory=head_memory,
+        )
+        next_hops = []
+        for k, res in probed.items():
+            location = res.pop("location", None)
+            if location is None:
+                fresh[k] = res
+                continue
+            target = url_cache_key(urljoin(k, location))
+            redirects[k] = target
+            hop_status[k] = res["status"]
+            if target not in cache and target not in redirects and target not in probed:
+                next_hops.append(target)
+        cache.update(fresh)
+        pending = list(dict.fromkeys(next_hops))
+
+    resolved = {k: _resolve_redirect(k, redirects, cache, hop_status) for k in redirects}
+    # A hop-by-hop "loop" is often a server that sets a cookie and redirects back to the same URL, or a
+    # redirect that only adds tracking params (same canonical key): confirm it with one follow-through
+    # request, which carries cookies across hops, before reporting it.
+    loops = [k for k, res in resolved.items() if res["kind"] == "redirect_loop"]
+    if loops:
+        confirmed = probe_urls_politely(
+            loops,
+            timeout=timeout,
+            workers=workers,
+            limiter=limiter,
+            sess=sess,
+            head_memory=head_memory,
+            follow_redirects=True,
+        )
+        for k in loops:
+            res = confirmed[k]
+            if res["kind"] != "redirect_loop":
+                resolved[k] = {**res, "chain": resolved[k]["chain"]}
+    for k, res in resolved.items():
+        fresh[k] = cache[k] = res
+    if store is not None and fresh:
+        store.put_many(fresh)
+    return {u: cache[keys[u]] for u in urls}
+
+HC_ARTICLE_PATH_RE = re.compile(r"^/hc/(?:([A-Za-z]{2,3}(?:-[A-Za-z0-9]+)*)/)?articles/(\d+)(?:[-/]|$)")
+
+INTERNAL_ARTICLE_OK = {"ok": True, "status": None, "kind": None, "severity": "info"}
+INTERNAL_ARTICLE_MISSING = {"ok": False, "status": None, "kind": "internal_article_missing", "severity": "critical"}
+
+class HelpCenterIndex:
+    """
+    Article ids seen while listing (with locale and draft flag), so links to this Help Center's
+    own articles are resolved without an HTTP probe.
+    """
 
-    cache[url] = result
-    return result
+    def __init__(self, base_url: str):
+        self.host = url_host(base_url)
+        self._articles: Dict[int, Tuple[str, bool]] = {}
+
+    def add(self, articles: List[Dict[str, Any]]) -> List[Tuple[int, str, bool]]:
+        """Indexes a listing page; returns the (id, locale, draft) entries added, for checkpoints."""
+        entries = []
+        for art in articles:
+            try:
+                aid = int(art.get("id"))
+            except (TypeError, ValueError):
+                continue
+            entries.append((aid, (art.get("locale") or "").lower(), bool(art.get("draft"))))
+        self.add_entries(entries)
+        return entries
+
+    def add_entries(self, entries: List[Tuple[int, str, bool]]) -> None:
+        for aid, locale, draft in entries:
+            self._articles[aid] = (locale, draft)
+
+    def lookup(self, url: str) -> str:
+        """
+        "external" (not an article link on this Help Center), "ok" (listed, same locale, published),
+        "missing" (id not listed so far) or "probe" (listed, but the locale or draft state needs a real check).
+        """
+        p = urlsplit(url)
+        if (p.hostname or "").lower() != self.host:
+            return "external"
+        m = HC_ARTICLE_PATH_RE.match(p.path)
+        if not m:
+            return "external"
+        known = self._articles.get(int(m.group(2)))
+        if known is None:
+            return "missing"
+        locale, draft = known
+        link_locale = (m.group(1) or "").lower()
+        if draft or (link_locale and link_locale != locale):
+            return "probe"
+        return "ok"
 
 def severity_rank(sev: str) -> int:
     return {"critical": 0, "warning": 1, "info": 2}.get(str(sev), 2)
 
-def push_log(msg: str, limit: int = 14):
-    st.session_state.last_logs.insert(0, msg)
-    st.session_state.last_logs = st.session_state.last_logs[:limit]
+def xlsx_export_error() -> Optional[str]:
+    """Why XLSX export can't work here (without building anything), or None."""
+    if importlib.util.find_spec("openpyxl") is None:
+        return "XLSX export requires the 'openpyxl' package."
+    return None
 
-def log_connection_established():
-    st.session_state.connected_ok = True
-    push_log("✅ Connected to Zendesk")
+def parquet_export_error() -> Optional[str]:
+    """Why Parquet export can't work here (without building anything), or None."""
+    if importlib.util.find_spec("pyarrow") is None:
+        return "Parquet export requires the 'pyarrow' package."
+    return None
 
-def get_xlsx_bytes_safe(df: pd.DataFrame) -> Tuple[Optional[bytes], Optional[str]]:
-    try:
-        import openpyxl  # noqa: F401
-    except Exception:
-        return None, "XLSX export requires the 'openpyxl' package."
-    bio = BytesIO()
-    with pd.ExcelWriter(bio, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="Findings")
-    return bio.getvalue(), None
+class ExportCache:
+    """
+    Export files built on demand, keyed by (scan_id, findings version, format).
+    Only the most recently used few are kept; a rerun that downloads nothing builds nothing.
+    A build that raises is not cached: the error is re-raised (the download fails instead of serving
+    an empty file) and kept for `error` so the next rerun can show it.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._files: "OrderedDict[Tuple[str, int, str], bytes]" = OrderedDict()
+        self._errors: "OrderedDict[Tuple[str, int, str], str]" = OrderedDict()
+
+    def get_or_build(self, key: Tuple[str, int, str], build) -> bytes:
+        with self._lock:
+            data = self._files.get(key)
+            if data is not None:
+                self._files.move_to_end(key)
+                return data
+        try:
+            data = build()
+        except Exception as e:
+            with self._lock:
+                self._errors[key] = str(e) or type(e).__name__
+                while len(self._errors) > self.max_entries:
+                    self._errors.popitem(last=False)
+            raise
+        with self._lock:
+            self._errors.pop(key, None)
+            self._files[key] = data
+            while len(self._files) > self.max_entries:
+                self._files.popitem(last=False)
+        return data
+
+    def error(self, key: Tuple[str, int, str]) -> Optional[str]:
+        """Why the last build for `key` failed, if it did (and nothing has been built for it since)."""
+        with self._lock:
+            return self._errors.get(key)
+
+@st.cache_resource(show_spinner=False)
+def get_export_cache() -> ExportCache:
+    return ExportCache()
+
+ARTICLE_SUMMARY_COLUMNS = ["Title", "URL", "Typos", "Stale", "Alt", "ID"]
+
+def frame_rows(df: pd.DataFrame):
+    """DataFrame rows as lists, NaN/None as None (an empty cell)."""
+    for row in df.itertuples(index=False, name=None):
+        yield [None if (v is None or (isinstance(v, float) and v != v)) else v for v in row]
+
+def write_xlsx_stream(fileobj, sheets: List[Tuple[str, List[str], Any]]) -> None:
+    """
+    Writes (sheet name, header, row iterable) sheets with openpyxl's write-only mode: rows go to disk
+    as they are appended, so memory doesn't grow with the row count.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    from openpyxl.styles import Font
+
+    wb = Workbook(write_only=True)
+    bold = Font(bold=True)
+    for name, header, rows in sheets:
+        ws = wb.create_sheet(title=name)
+        cells = []
+        for h in header:
+            cell = WriteOnlyCell(ws, value=h)
+            cell.font = bold
+            cells.append(cell)
+        ws.append(cells)
+        for row in rows:
+            ws.append([ILLEGAL_CHARACTERS_RE.sub("", v) if isinstance(v, str) else v for v in row])
+    wb.save(fileobj)
+
+EXPORT_CHUNK_ROWS = 10_000
+EXPORT_CATEGORICAL_COLUMNS = ("Severity", "Type")
+
+def frame_chunks(df: pd.DataFrame, size: int = EXPORT_CHUNK_ROWS):
+    """The frame in row slices (views, not copies) so exports never materialize a second full copy."""
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
+
+def _typed_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """HTTP Status as a nullable integer (not 404.0) for typed formats."""
+    if "HTTP Status" not in chunk.columns:
+        return chunk
+    status = pd.to_numeric(chunk["HTTP Status"], errors="coerce").astype("Int64")
+    return chunk.assign(**{"HTTP Status": status})
+
+def write_xlsx_export(fileobj, df: pd.DataFrame, articles: Optional[List[Dict[str, Any]]]) -> None:
+    sheets: List[Tuple[str, List[str], Any]] = [("Findings", list(df.columns), frame_rows(df))]
+    if articles is not None:
+        sheets.append(
+            ("Articles", ARTICLE_SUMMARY_COLUMNS, ([r.get(c) for c in ARTICLE_SUMMARY_COLUMNS] for r in articles))
+        )
+    write_xlsx_stream(fileobj, sheets)
+
+def write_csv_export(fileobj, df: pd.DataFrame, articles: Optional[List[Dict[str, Any]]]) -> None:
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    if df.empty:
+        df.to_csv(text, index=False)
+    for i, chunk in enumerate(frame_chunks(df)):
+        chunk.to_csv(text, index=False, header=(i == 0))
+    text.flush()
+    text.detach()
+
+def write_csv_gz_export(fileobj, df: pd.DataFrame, articles: Optional[List[Dict[str, Any]]]) -> None:
+    # mtime=0 keeps the archive byte-identical across rebuilds of the same findings.
+    with gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6, mtime=0) as gz:
+        write_csv_export(gz, df, articles)
+
+def write_jsonl_export(fileobj, df: pd.DataFrame, articles: Optional[List[Dict[str, Any]]]) -> None:
+    cols = list(df.columns)
+    status_idx = cols.index("HTTP Status") if "HTTP Status" in cols else None
+    for chunk in frame_chunks(df):
+        lines = []
+        for row in frame_rows(chunk):
+            if status_idx is not None and row[status_idx] is not None:
+                row[status_idx] = int(row[status_idx])
+            lines.append(json.dumps(dict(zip(cols, row)), ensure_ascii=False))
+        fileobj.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+def write_parquet_export(fileobj, df: pd.DataFrame, articles: Optional[List[Dict[str, Any]]]) -> None:
+    """
+    One row group per chunk. Severity/Type are dictionary-encoded, so each distinct value is stored
+    once per row group and loads back as a pandas category.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fields = []
+    for col in df.columns:
+        if col in EXPORT_CATEGORICAL_COLUMNS:
+            fields.append(pa.field(col, pa.dictionary(pa.int32(), pa.string())))
+        elif col == "HTTP Status":
+            fields.append(pa.field(col, pa.int32()))
+        else:
+            fields.append(pa.field(col, pa.string()))
+    schema = pa.schema(fields)
+
+    with pq.ParquetWriter(fileobj, schema, compression="zstd") as writer:
+        for chunk in frame_chunks(df):
+            chunk = _typed_chunk(chunk)
+            arrays = []
+            for field in schema:
+                values = chunk[field.name]
+                if pa.types.is_dictionary(field.type):
+                    arrays.append(pa.array(values.astype("string"), type=pa.string()).dictionary_encode())
+                elif field.name == "HTTP Status":
+                    arrays.append(pa.array(values, type=pa.int32()))
+                else:
+                    arrays.append(pa.array(values.astype("string"), type=pa.string()))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+# Download formats, in the order the UI offers them. `build` writes to a binary file object;
+# `error` says (without building anything) why a format can't be produced here.
+EXPORT_FORMATS: Dict[str, Dict[str, Any]] = {
+    "xlsx": {
+        "label": "XLSX",
+        "file_name": "zenaudit_report.xlsx",
+        "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "build": write_xlsx_export,
+        "error": xlsx_export_error,
+    },
+    "csv": {
+        "label": "CSV",
+        "file_name": "zenaudit_report.csv",
+        "mime": "text/csv",
+        "build": write_csv_export,
+        "error": None,
+    },
+    "csv.gz": {
+        "label": "CSV (gzip)",
+        "file_name": "zenaudit_report.csv.gz",
+        "mime": "application/gzip",
+        "build": write_csv_gz_export,
+        "error": None,
+    },
+    "jsonl": {
+        "label": "JSON Lines",
+        "file_name": "zenaudit_report.jsonl",
+        "mime": "application/x-ndjson",
+        "build": write_jsonl_export,
+        "error": None,
+    },
+    "parquet": {
+        "label": "Parquet",
+        "file_name": "zenaudit_report.parquet",
+        "mime": "application/vnd.apache.parquet",
+        "build": write_parquet_export,
+        "error": parquet_export_error,
+    },
+}
+
+def export_format_error(fmt: str) -> Optional[str]:
+    check = EXPORT_FORMATS[fmt]["error"]
+    return check() if check else None
+
+def build_export(
+    fmt: str, df: pd.DataFrame, articles: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """One export file, streamed through a temp file in chunks; (None, reason) if the format is unavailable."""
+    err = export_format_error(fmt)
+    if err:
+        return None, err
+    with tempfile.TemporaryFile() as tmp:
+        EXPORT_FORMATS[fmt]["build"](tmp, df, articles)
+        tmp.seek(0)
+        return tmp.read(), None
 
 def _make_clickable(v: Any) -> str:
     s = "" if v is None else str(v)
@@ -664,18 +2242,60 @@ def _make_clickable(v: Any) -> str:
         return f'<a href="{s}" target="_blank" rel="noopener">{s}</a>'
     return s
 
-def render_table_no_toolbar(df: pd.DataFrame) -> None:
+def render_table_no_toolbar(df: pd.DataFrame, key: str = "findings_table", filters: Tuple = ()) -> None:
+    """
+    One page of `df` as an HTML table, with page size / page controls underneath. Only the visible
+    slice is copied and turned into HTML, so render time and payload don't grow with the row count.
+    `filters` are the inputs that produced `df` (scan, severity, type, search): the page goes back to 1
+    only when they change, so a table that grows while you read it (live scan) stays where it is.
+    """
     if df is None or df.empty:
         st.info("No findings to display yet. Run a scan to generate results.")
         return
 
-    show = df.copy()
+    total = len(df)
+    size_key, page_key, filters_key = f"{key}_page_size", f"{key}_page", f"{key}_filters"
+    page_size = int(st.session_state.get(size_key, TABLE_DEFAULT_PAGE_SIZE))
+    pages = max(1, -(-total // page_size))
+    # New filter/search results start on page 1; a shrunken result set can't leave us past the end.
+    filters_hash = hash(repr(filters))
+    if st.session_state.get(filters_key) != filters_hash:
+        st.session_state[filters_key] = filters_hash
+        st.session_state[page_key] = 1
+    elif int(st.session_state.get(page_key, 1)) > pages:
+        st.session_state[page_key] = pages
+
+    table_area = st.container()
+
+    if total > min(TABLE_PAGE_SIZES):
+        p1, p2, p3 = st.columns([2.6, 0.9, 0.9])
+        with p2:
+            page_size = int(
+                st.selectbox(
+                    "Rows per page",
+                    TABLE_PAGE_SIZES,
+                    index=TABLE_PAGE_SIZES.index(TABLE_DEFAULT_PAGE_SIZE),
+                    key=size_key,
+                )
+            )
+            pages = max(1, -(-total // page_size))
+            if int(st.session_state.get(page_key, 1)) > pages:
+                st.session_state[page_key] = pages
+        with p3:
+            page = int(st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=page_key))
+        start = (page - 1) * page_size
+        with p1:
+            st.caption(f"Showing {start + 1:,}–{min(start + page_size, total):,} of {total:,} findings")
+    else:
+        start = 0
+
+    show = df.iloc[start : start + page_size].copy()
     for col in ("Article URL", "Target URL"):
         if col in show.columns:
             show[col] = show[col].map(_make_clickable)
 
     html = show.to_html(index=False, escape=False, classes="za-table")
-    st.markdown(
+    table_area.markdown(
         f"""
 <div class="za-tablewrap">
   <div class="za-scroll">
@@ -701,7 +2321,7 @@ def worker_get_status(email: str) -> Tuple[bool, int, str]:
     if not base:
         return False, 0, "Missing WORKER_BASE_URL in Streamlit secrets."
     try:
-        r = requests.get(f"{base}/status", params={"email": email}, timeout=10)
+        r = get_http_session("worker").get(f"{base}/status", params={"email": email}, timeout=10)
         if r.status_code != 200:
             log_event(
                 "worker_status_fail",
@@ -729,7 +2349,7 @@ def worker_consume(email: str) -> Tuple[bool, int, str]:
     if not base:
         return False, 0, "Missing WORKER_BASE_URL in Streamlit secrets."
     try:
-        r = requests.get(f"{base}/consume", params={"email": email}, timeout=15)
+        r = get_http_session("worker").get(f"{base}/consume", params={"email": email}, timeout=15)
         if r.status_code != 200:
             log_event(
                 "worker_consume_fail",
@@ -780,8 +2400,359 @@ def try_unlock_from_status(email: str) -> None:
 # =========================
 # 5) SCAN ENGINE
 # =========================
+def fetch_articles_page(
+    sess: requests.Session,
+    url: str,
+    auth: Tuple[str, str],
+    scan_id: str,
+    user_hash: str,
+    user_domain: str,
+) -> Dict[str, Any]:
+    with timed_phase(scan_id, "zendesk_fetch_page", page_url=url[:200]):
+        r = zendesk_get(sess, url, auth, scan_id)
+
+    if r.status_code == 401:
+        log_event("zendesk_auth_fail", scan_id, user_hash=user_hash, user_domain=user_domain, http_status=401)
+        raise RuntimeError("Auth failed (401). Check email/token and Zendesk API settings.")
+
+    if r.status_code >= 400:
+        log_event(
+            "zendesk_http_error",
+            scan_id,
+            user_hash=user_hash,
+            user_domain=user_domain,
+            http_status=r.status_code,
+            page_url=url[:200],
+        )
+    r.raise_for_status()
+    return r.json()
+
+def article_list_url(base_url: str, mode: str, start_time: Optional[int] = None) -> str:
+    """
+    First page URL for the chosen listing mode.
+    Cursor pages cost the same however deep the listing goes; offset paging slows down and is capped by Zendesk.
+    Incremental returns only articles updated at/after `start_time` (unix seconds).
+    """
+    if mode == "incremental":
+        return f"{base_url}/api/v2/help_center/incremental/articles.json?start_time={int(start_time or 0)}"
+    if mode == "offset":
+        return f"{base_url}/api/v2/help_center/articles.json?per_page={ZENDESK_PER_PAGE}"
+    return f"{base_url}/api/v2/help_center/articles.json?page[size]={ZENDESK_PER_PAGE}"
+
+def next_article_page_url(data: Dict[str, Any], page_url: str) -> Optional[str]:
+    """Next page URL for any listing mode, or None when the listing is complete."""
+    if "meta" in data or "links" in data:
+        # Cursor pagination
+        meta = data.get("meta") or {}
+        nxt = (data.get("links") or {}).get("next")
+        return nxt if (meta.get("has_more") and nxt) else None
+
+    nxt = data.get("next_page")
+    # Incremental export keeps handing out a next_page; an empty page (or a self-link) is the end.
+    if not nxt or nxt == page_url or not data.get("articles"):
+        return None
+    return nxt
+
+def prefetch_article_pages(first_url: str, fetch_page, depth: int = ZENDESK_PREFETCH_PAGES):
+    """
+    Yields (page_url, page_data) while a background thread fetches the following pages.
+    At most `depth` pages wait in the queue; the fetcher blocks when it is full (backpressure).
+    Fetch errors are re-raised in the consuming thread. Stopping early (break/close) stops the fetcher.
+    """
+    q: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(depth or 1)))
+    stop = threading.Event()
+    done = object()
+
+    def _put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        page_url = first_url
+        try:
+            while page_url and not stop.is_set():
+                data = fetch_page(page_url)
+                if not _put((page_url, data)):
+                    return
+                page_url = next_article_page_url(data, page_url)
+        except BaseException as e:  # handed to the consumer
+            _put(e)
+            return
+        _put(done)
+
+    threading.Thread(target=_produce, name="zenaudit-fetch", daemon=True).start()
+    try:
+        while True:
+            item = q.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+@st.cache_resource(show_spinner="Loading spelling dictionary…")
+def get_spellchecker() -> SpellChecker:
+    """
+    Process-wide SpellChecker, built on the first typo check rather than at import:
+    Streamlit re-runs this script on every interaction, and most reruns never need it.
+    """
+    t0 = time.time()
+    rss0 = process_rss_kb()
+    spell = load_spellchecker(SPELL_DICTIONARY_PATH)
+    rss1 = process_rss_kb()
+    log_event(
+        "spellchecker_loaded",
+        "",
+        elapsed_ms=int((time.time() - t0) * 1000),
+        words=len(spell.word_frequency.dictionary),
+        rss_delta_kb=(rss1 - rss0) if (rss0 is not None and rss1 is not None) else None,
+        dictionary=SPELL_DICTIONARY_PATH or "en",
+    )
+    return spell
+
+def spell_vocab_key(subdomain: str) -> str:
+    """Verdict-cache key: verdicts are only valid for the dictionary that produced them."""
+    if not SPELL_DICTIONARY_PATH:
+        return subdomain
+    return f"{subdomain}@{os.path.basename(SPELL_DICTIONARY_PATH)}"
+
+def analyze_article(
+    art: Dict[str, Any],
+    base_url: str,
+    scan_id: str,
+    do_typo: bool,
+    spell: Optional[SpellChecker] = None,
+    vocab: Optional[WordVerdictCache] = None,
+    allow: FrozenSet[str] = frozenset(),
+) -> Dict[str, Any]:
+    """
+    Runs the content (non-network) checks for one article body in this process.
+    The result depends only on the body, so it can be stored and reused while `updated_at` is unchanged.
+    `typos` is None when the typo check was skipped.
+    """
+    body = art.get("body", "") or ""
+    article_url = art.get("html_url") or f"{base_url}/hc/articles/{art.get('id')}"
+
+    with timed_phase(scan_id, "parse_article", article_id=art.get("id"), article_url=article_url[:200]):
+        text_raw, links, images, alt_miss = extract_links_images(body, base_url=base_url)
+
+    typos = None
+    if do_typo and spell is not None:
+        with timed_phase(scan_id, "typo_check", article_id=art.get("id")):
+            typos = count_typos(text_raw, spell, vocab, allow)
+
+    return {
+        "typos": typos,
+        "alt_miss": alt_miss,
+        "links": list(dict.fromkeys(links)),
+        "images": images,
+    }
+
+@st.cache_resource(show_spinner=False)
+def get_cpu_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Long-lived worker pool shared by all sessions; each worker loads its own SpellChecker on first use.
+    With fork, the first submit starts every worker, so one no-op job here forks them all now, on this
+    (script) thread, instead of later from a scan thread. See CPU_WORKERS for why this matters.
+    """
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=init_worker,
+        initargs=(SPELL_DICTIONARY_PATH,),
+    )
+    pool.submit(int).result()
+    return pool
+
+@st.cache_resource(show_spinner=False)
+def get_cpu_pool_broken() -> threading.Event:
+    """Set once the shared pool has broken; it is then left alone rather than re-forked from a busy server."""
+    return threading.Event()
+
+# Fork the workers on the first script run in this process, before any scan thread can exist.
+if CPU_WORKERS > 1 and not get_cpu_pool_broken().is_set():
+    get_cpu_pool(CPU_WORKERS)
+
+def analyze_articles(
+    arts: List[Dict[str, Any]],
+    base_url: str,
+    scan_id: str,
+    do_typo: bool,
+    vocab: WordVerdictCache,
+    vocab_key: str,
+    allow: FrozenSet[str] = frozenset(),
+    pool: Optional[ProcessPoolExecutor] = None,
+    spell: Optional[SpellChecker] = None,
+    pool_broken: Optional[threading.Event] = None,
+    spell_loader: Optional[Callable[[], SpellChecker]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    analyze_article for a batch, in input order. Uses `pool` (see get_cpu_pool) when given;
+    results are identical to the in-process path with `spell`, which is also the fallback if the pool breaks.
+    A broken pool is flagged on `pool_broken` (see get_cpu_pool_broken) and not used again.
+    Without `spell`, the in-process path gets one from `spell_loader` (so a scan loads it once, not per batch).
+    Pool workers keep their own per-KB verdict caches; what they learn is merged into `vocab`.
+    """
+    if pool_broken is not None and pool_broken.is_set():
+        pool = None
+    if pool is not None and len(arts) > 1:
+        jobs = [(art.get("body", "") or "", base_url, do_typo, vocab_key) for art in arts]
+        try:
+            with timed_phase(scan_id, "analyze_articles_pool", article_count=len(jobs), workers=CPU_WORKERS):
+                chunk = max(1, len(jobs) // (CPU_WORKERS * 4))
+                out: List[Dict[str, Any]] = []
+                job_fn = partial(analyze_body_job, allow=allow)
+                for analysis, learned, hits, misses in pool.map(job_fn, jobs, chunksize=chunk):
+                    vocab.merge(learned, hits=hits, misses=misses)
+                    out.append(analysis)
+                return out
+        except BrokenProcessPool:
+            if pool_broken is not None and not pool_broken.is_set():
+                pool_broken.set()
+                log_event("cpu_pool_broken", scan_id, workers=CPU_WORKERS)
+
+    if do_typo and spell is None:
+        spell = spell_loader() if spell_loader is not None else load_spellchecker(SPELL_DICTIONARY_PATH)
+    return [analyze_article(art, base_url, scan_id, do_typo=do_typo, spell=spell, vocab=vocab, allow=allow) for art in arts]
+
+def article_item(
+    art: Dict[str, Any],
+    base_url: str,
+    analysis: Dict[str, Any],
+    do_typo: bool,
+    do_stale: bool,
+    do_alt: bool,
+) -> Dict[str, Any]:
+    """Combines listing fields, content analysis and the enabled layers into the record used for output."""
+    is_stale = False
+    if do_stale:
+        updated = safe_parse_updated_at(art.get("updated_at", ""))
+        if updated:
+            is_stale = (datetime.utcnow() - updated) > timedelta(days=365)
+
+    return {
+        "id": art.get("id"),
+        "title": art.get("title", "") or "",
+        "url": art.get("html_url") or f"{base_url}/hc/articles/{art.get('id')}",
+        "typos": (analysis["typos"] or 0) if do_typo else 0,
+        "is_stale": is_stale,
+        "alt_miss": analysis["alt_miss"] if do_alt else 0,
+        "links": analysis["links"],
+        "images": analysis["images"],
+    }
+
+def link_detail(res: Dict[str, Any]) -> str:
+    chain = res.get("chain")
+    if not chain:
+        return res["kind"]
+    return f"{res['kind']} (redirects: {' → '.join(chain)})"
+
+def redirect_chain_finding(title: str, article_url: str, target: str, res: Dict[str, Any]) -> Dict[str, Any]:
+    chain = res["chain"]
+    return {
+        "Severity": "info",
+        "Type": "redirect_chain",
+        "Article Title": title,
+        "Article URL": article_url,
+        "Target URL": target,
+        "HTTP Status": res["status"],
+        "Detail": f"{len(chain)} redirects: {' → '.join(chain)}",
+        "Suggested Fix": "Point the link straight at the final destination.",
+    }
+
+def build_article_findings(
+    item: Dict[str, Any],
+    statuses: Dict[str, Dict[str, Any]],
+    do_stale: bool,
+    do_alt: bool,
+    do_links: bool,
+    do_images: bool,
+) -> List[Dict[str, Any]]:
+    title = item["title"]
+    article_url = item["url"]
+    out: List[Dict[str, Any]] = []
+
+    if do_alt:
+        for img in item["images"]:
+            if img["missing_alt"]:
+                out.append(
+                    {
+                        "Severity": "warning",
+                        "Type": "missing_alt",
+                        "Article Title": title,
+                        "Article URL": article_url,
+                        "Target URL": img["src"],
+                        "HTTP Status": None,
+                        "Detail": "missing_alt",
+                        "Suggested Fix": "Add descriptive alt text to improve accessibility and AI-readiness.",
+                    }
+                )
+
+    if do_links:
+        for lk in item["links"]:
+            res = statuses[lk]
+            if res["ok"] is False:
+                out.append(
+                    {
+                        "Severity": res["severity"],
+                        "Type": "broken_link",
+                        "Article Title": title,
+                        "Article URL": article_url,
+                        "Target URL": lk,
+                        "HTTP Status": res["status"],
+                        "Detail": link_detail(res),
+                        "Suggested Fix": "Update/remove the link, or replace it with a working destination.",
+                    }
+                )
+            elif res["ok"] and len(res.get("chain", [])) >= LINK_CHECK_REDIRECT_CHAIN_MIN:
+                out.append(redirect_chain_finding(title, article_url, lk, res))
+
+    if do_images:
+        for img in item["images"]:
+            src = img["src"]
+            res = statuses[src]
+            if res["ok"] is False:
+                out.append(
+                    {
+                        "Severity": res["severity"],
+                        "Type": "broken_image",
+                        "Article Title": title,
+                        "Article URL": article_url,
+                        "Target URL": src,
+                        "HTTP Status": res["status"],
+                        "Detail": link_detail(res),
+                        "Suggested Fix": "Fix the image URL or re-upload the image to a stable location.",
+                    }
+                )
+            elif res["ok"] and len(res.get("chain", [])) >= LINK_CHECK_REDIRECT_CHAIN_MIN:
+                out.append(redirect_chain_finding(title, article_url, src, res))
+
+    if do_stale and item["is_stale"]:
+        out.append(
+            {
+                "Severity": "info",
+                "Type": "stale_content",
+                "Article Title": title,
+                "Article URL": article_url,
+                "Target URL": None,
+                "HTTP Status": None,
+                "Detail": "updated_over_365_days",
+                "Suggested Fix": "Review/update this article; stale content reduces trust and deflection.",
+            }
+        )
+
+    return out
+
 def run_scan(
-    subdomain: str,
+    job: "ScanJob",
+    services: "ScanServices",
     email: str,
     token: str,
     do_stale: bool,
@@ -789,31 +2760,76 @@ def run_scan(
     do_alt: bool,
     do_links: bool,
     do_images: bool,
-    max_articles: int,
-    progress_cb,
-    status_cb,
+    changed_since: Optional[datetime] = None,
+    incremental: bool = False,
+    learn_dictionary: bool = True,
+    resume: Optional[Dict[str, Any]] = None,
 ):
-    scan_id = str(uuid.uuid4())
-    st.session_state.scan_id = scan_id
-    st.session_state.scan_started_at = datetime.utcnow().isoformat() + "Z"
-
-    st.session_state.scan_results = []
-    st.session_state.findings = []
-    st.session_state.last_logs = []
-    st.session_state.url_cache = {}
-    st.session_state.scan_running = True
-    st.session_state.last_scanned_title = ""
-    st.session_state.connected_ok = False
+    """
+    Runs on a background thread (see ScanJobRegistry): everything the page shows is written to `job`,
+    and process-wide resources come from `services`, so nothing here touches Streamlit.
+    Each completed page is checkpointed; with `resume` (ScanCheckpointStore.load) the listing continues
+    after the last checkpointed page, and `job` is expected to hold that checkpoint's rows already.
+    """
+    scan_id = job.scan_id
+    subdomain = job.subdomain
+    max_articles = job.max_articles
 
     user_hash = _hash_email(email)
     user_domain = _safe_domain(email)
 
     auth = (f"{email}/token", token)
     base_url = f"https://{subdomain}.zendesk.com"
-    url = f"{base_url}/api/v2/help_center/articles.json?per_page={ZENDESK_PER_PAGE}"
+    if changed_since:
+        list_mode = "incremental"
+        start_time = int((changed_since - datetime(1970, 1, 1)).total_seconds())
+    else:
+        list_mode = ZENDESK_LIST_MODE if ZENDESK_LIST_MODE in ZENDESK_LIST_MODES else "cursor"
+        start_time = 0
+    url: Optional[str] = article_list_url(base_url, list_mode, start_time=start_time)
+
+    url_store = services.url_store
+    checkpoints = services.checkpoints
+    article_store = services.article_store
+    vocab_store = services.vocab_store
+    vocab = WordVerdictCache(vocab_store.load(spell_vocab_key(subdomain)) if vocab_store is not None else None)
+    # Custom dictionary for this KB, loaded once and fixed for the whole scan, so an article's typo count
+    # doesn't depend on which page it was listed on. Terms learned from titles/labels are saved at the end
+    # (for the next scan); stored results are only reused under the same allow-list version.
+    allow: FrozenSet[str] = vocab_store.load_allow_list(subdomain) if vocab_store is not None else frozenset()
+    allow_version = allow_list_version(allow) if do_typo else ""
+    learned_terms: set = set()
 
     scanned = 0
+    reused = 0
     connection_logged = False
+    # Links to article ids not listed yet wait for the full listing; their articles' findings are emitted at the end.
+    hc_index = HelpCenterIndex(base_url)
+    internal_resolved = 0
+    deferred_links: set = set()
+    deferred_items: List[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]] = []
+    listing_complete = changed_since is None
+    page_no = 0
+
+    if resume is not None and (resume["pages"] or resume["listing_done"]):
+        url = resume["next_url"]
+        page_no = resume["pages"]
+        scanned = resume["scanned"]
+        reused = resume["reused"]
+        internal_resolved = resume["internal_resolved"]
+        listing_complete = resume["listing_complete"]
+        hc_index.add_entries([tuple(e) for e in resume["index"]])
+        for entry in resume["deferred"]:
+            item, statuses = entry[0], entry[1]
+            if len(entry) > 2:
+                item_deferred = entry[2]
+            else:
+                # Checkpoints written before the deferred set was saved: only targets the scan checked count.
+                checked = (item["links"] if do_links else []) + ([img["src"] for img in item["images"]] if do_images else [])
+                item_deferred = [u for u in checked if statuses.get(u) is None]
+                statuses = {u: v for u, v in statuses.items() if v is not None}
+            deferred_items.append((item, statuses))
+            deferred_links.update(item_deferred)
 
     log_event(
         "scan_start",
@@ -828,199 +2844,516 @@ def run_scan(
         do_links=bool(do_links),
         do_images=bool(do_images),
         max_articles=int(max_articles or 0),
-    )
-
-    gads_event(
-        "zenaudit_scan_start",
-        scan_id=scan_id,
-        zd_subdomain=subdomain,
-        do_links=int(bool(do_links)),
-        do_images=int(bool(do_images)),
-        do_alt=int(bool(do_alt)),
-        do_typo=int(bool(do_typo)),
-        do_stale=int(bool(do_stale)),
+        list_mode=list_mode,
+        changed_since=changed_since.isoformat() + "Z" if changed_since else None,
+        incremental=bool(incremental),
+        resumed_from_page=page_no if resume is not None else None,
     )
 
     try:
         with timed_phase(scan_id, "zendesk_list_articles", zd_subdomain=subdomain):
-            while url:
-                with timed_phase(scan_id, "zendesk_fetch_page", page_url=url[:200]):
-                    r = requests.get(url, auth=auth, timeout=REQUEST_TIMEOUT)
+            zd_session = services.http_sessions["zendesk"]
 
-                if r.status_code == 401:
-                    log_event("zendesk_auth_fail", scan_id, user_hash=user_hash, user_domain=user_domain, http_status=401)
-                    raise RuntimeError("Auth failed (401). Check email/token and Zendesk API settings.")
-
-                if r.status_code >= 400:
-                    log_event(
-                        "zendesk_http_error",
-                        scan_id,
-                        user_hash=user_hash,
-                        user_domain=user_domain,
-                        http_status=r.status_code,
-                        page_url=url[:200],
-                    )
-                r.raise_for_status()
+            def fetch_page(page_url: str) -> Dict[str, Any]:
+                return fetch_articles_page(zd_session, page_url, auth, scan_id, user_hash=user_hash, user_domain=user_domain)
 
+            # Pages are fetched ahead on a background thread; this loop is the parse/typo/link consumer.
+            pages = prefetch_article_pages(url, fetch_page, depth=ZENDESK_PREFETCH_PAGES) if url else iter(())
+            for page_url, data in pages:
                 if not connection_logged:
-                    log_connection_established()
+                    job.mark_connected()
                     connection_logged = True
 
-                data = r.json()
+                results_before, findings_before, cache_before = len(job.results), len(job.findings), len(job.url_cache)
                 articles = data.get("articles", [])
+                index_entries = hc_index.add(articles)
+
+                if max_articles:
+                    articles = articles[: max(0, max_articles - scanned)]
+
+                stored = (
+                    article_store.get_many(
+                        subdomain, [a.get("id") for a in articles], allow_version=allow_version if do_typo else None
+                    )
+                    if article_store is not None
+                    else {}
+                )
 
+                analyses: List[Optional[Dict[str, Any]]] = []
                 for art in articles:
-                    scanned += 1
-                    if max_articles and scanned > max_articles:
-                        url = None
-                        break
-
-                    title = art.get("title", "") or ""
-                    st.session_state.last_scanned_title = title
-
-                    body = art.get("body", "") or ""
-                    article_url = art.get("html_url") or f"{base_url}/hc/articles/{art.get('id')}"
-
-                    with timed_phase(scan_id, "parse_article", article_id=art.get("id"), article_url=article_url[:200]):
-                        soup, text_raw, links, images = extract_links_images(body, base_url=base_url)
-
-                    typos = 0
-                    if do_typo:
-                        with timed_phase(scan_id, "typo_check", article_id=art.get("id")):
-                            text = (text_raw or "").lower()
-                            words = re.findall(r"[a-zA-Z']+", text)
-                            candidates = [w for w in spell.unknown(words) if len(w) > 2 and w.isalpha()]
-                            typos = len(candidates)
-
-                    is_stale = False
-                    if do_stale:
-                        updated = safe_parse_updated_at(art.get("updated_at", ""))
-                        if updated:
-                            is_stale = (datetime.utcnow() - updated) > timedelta(days=365)
-
-                    alt_miss = 0
-                    if do_alt:
-                        alt_miss = len([img for img in soup.find_all("img") if not (img.get("alt") or "").strip()])
-
-                    st.session_state.scan_results.append(
-                        {"Title": title, "URL": article_url, "Typos": typos, "Stale": is_stale, "Alt": alt_miss, "ID": art.get("id")}
+                    prev = stored.get(art.get("id"))
+                    if prev and prev[0] == (art.get("updated_at", "") or "") and (not do_typo or prev[1]["typos"] is not None):
+                        analyses.append(prev[1])
+                        reused += 1
+                    else:
+                        analyses.append(None)
+
+                todo = [i for i, a in enumerate(analyses) if a is None]
+                if do_typo and learn_dictionary and vocab_store is not None:
+                    for art in articles:
+                        learned_terms |= learn_terms(art.get("title", "") or "", art.get("label_names"))
+
+                to_store: List[Tuple[Any, str, Dict[str, Any]]] = []
+                if todo:
+                    job.set_title(articles[todo[0]].get("title", "") or "")
+                    batch = [articles[i] for i in todo]
+                    analyzed = analyze_articles(
+                        batch,
+                        base_url,
+                        scan_id,
+                        do_typo,
+                        vocab,
+                        vocab_key=spell_vocab_key(subdomain),
+                        allow=allow,
+                        pool=services.cpu_pool,
+                        spell=services.spell,
+                        pool_broken=services.cpu_pool_broken,
+                        spell_loader=services.spellchecker,
                     )
+                    for i, analysis in zip(todo, analyzed):
+                        analyses[i] = analysis
+                        to_store.append((articles[i].get("id"), articles[i].get("updated_at", "") or "", analysis))
 
-                    if do_alt:
-                        for img in images:
-                            if img["missing_alt"]:
-                                st.session_state.findings.append(
-                                    {
-                                        "Severity": "warning",
-                                        "Type": "missing_alt",
-                                        "Article Title": title,
-                                        "Article URL": article_url,
-                                        "Target URL": img["src"],
-                                        "HTTP Status": None,
-                                        "Detail": "missing_alt",
-                                        "Suggested Fix": "Add descriptive alt text to improve accessibility and AI-readiness.",
-                                    }
-                                )
-
-                    if do_links and links:
-                        with timed_phase(scan_id, "check_links", article_id=art.get("id"), link_count=len(links)):
-                            for lk in list(dict.fromkeys(links)):
-                                res = check_url_status(lk, timeout=8)
-                                if res["ok"] is False:
-                                    st.session_state.findings.append(
-                                        {
-                                            "Severity": res["severity"],
-                                            "Type": "broken_link",
-                                            "Article Title": title,
-                                            "Article URL": article_url,
-                                            "Target URL": lk,
-                                            "HTTP Status": res["status"],
-                                            "Detail": res["kind"],
-                                            "Suggested Fix": "Update/remove the link, or replace it with a working destination.",
-                                        }
-                                    )
-
-                    if do_images and images:
-                        with timed_phase(scan_id, "check_images", article_id=art.get("id"), image_count=len(images)):
-                            for img in images:
-                                src = img["src"]
-                                res = check_url_status(src, timeout=8)
-                                if res["ok"] is False:
-                                    st.session_state.findings.append(
-                                        {
-                                            "Severity": res["severity"],
-                                            "Type": "broken_image",
-                                            "Article Title": title,
-                                            "Article URL": article_url,
-                                            "Target URL": src,
-                                            "HTTP Status": res["status"],
-                                            "Detail": res["kind"],
-                                            "Suggested Fix": "Fix the image URL or re-upload the image to a stable location.",
-                                        }
-                                    )
-
-                    if do_stale and is_stale:
-                        st.session_state.findings.append(
-                            {
-                                "Severity": "info",
-                                "Type": "stale_content",
-                                "Article Title": title,
-                                "Article URL": article_url,
-                                "Target URL": None,
-                                "HTTP Status": None,
-                                "Detail": "updated_over_365_days",
-                                "Suggested Fix": "Review/update this article; stale content reduces trust and deflection.",
-                            }
+                page_items: List[Dict[str, Any]] = []
+                for art, analysis in zip(articles, analyses):
+                    scanned += 1
+                    job.set_title(art.get("title", "") or "")
+                    item = article_item(art, base_url, analysis, do_typo=do_typo, do_stale=do_stale, do_alt=do_alt)
+                    item["n"] = scanned
+                    page_items.append(item)
+
+                if article_store is not None and to_store:
+                    article_store.put_many(subdomain, to_store, allow_version=allow_version)
+                if vocab_store is not None and vocab.learned:
+                    vocab_store.save(spell_vocab_key(subdomain), vocab.drain_learned())
+
+                # Check every distinct link/image on the page in parallel, then emit rows in article order.
+                targets: List[str] = []
+                for item in page_items:
+                    if do_links:
+                        targets.extend(item["links"])
+                    if do_images:
+                        targets.extend(img["src"] for img in item["images"])
+
+                statuses: Dict[str, Dict[str, Any]] = {}
+                to_probe: List[str] = []
+                page_deferred = set()
+                for u in dict.fromkeys(targets):
+                    where = hc_index.lookup(u)
+                    if where == "ok":
+                        statuses[u] = INTERNAL_ARTICLE_OK
+                        internal_resolved += 1
+                    elif where == "missing":
+                        page_deferred.add(u)
+                    else:
+                        to_probe.append(u)
+                deferred_links |= page_deferred
+                if to_probe:
+                    with timed_phase(scan_id, "check_urls", url_count=len(to_probe), workers=LINK_CHECK_WORKERS):
+                        statuses.update(check_urls_concurrent(to_probe, job.url_cache, store=url_store, **services.prober))
+
+                page_deferred_items: List[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]], List[str]]] = []
+                for item in page_items:
+                    job.add_result(
+                        {
+                            "Title": item["title"],
+                            "URL": item["url"],
+                            "Typos": item["typos"],
+                            "Stale": item["is_stale"],
+                            "Alt": item["alt_miss"],
+                            "ID": item["id"],
+                        }
+                    )
+                    item_targets = item["links"] + [img["src"] for img in item["images"]]
+                    if page_deferred and any(u in page_deferred for u in item_targets):
+                        deferred_items.append((item, statuses))
+                        # Only what this page actually resolved or deferred, so a resume never probes
+                        # targets the scan didn't check (e.g. links with "Broken Links" off).
+                        page_deferred_items.append(
+                            (
+                                item,
+                                {u: statuses[u] for u in item_targets if u in statuses},
+                                [u for u in item_targets if u in page_deferred],
+                            )
+                        )
+                    else:
+                        job.add_findings(
+                            build_article_findings(
+                                item, statuses, do_stale=do_stale, do_alt=do_alt, do_links=do_links, do_images=do_images
+                            )
                         )
 
-                    push_log(f"✅ {scanned}: {title[:60]}")
-                    progress_cb(scanned)
-                    status_cb(scanned)
+                    job.push_log(f"✅ {item['n']}: {item['title'][:60]}")
 
-                url = data.get("next_page")
+                stop = bool(max_articles and scanned >= max_articles)
+                if stop:
+                    listing_complete = False
+                if checkpoints is not None:
+                    checkpoints.save_page(
+                        scan_id,
+                        page_no,
+                        {
+                            "results": job.results[results_before:],
+                            "findings": job.findings.rows(findings_before),
+                            "deferred": page_deferred_items,
+                            "index": index_entries,
+                            "url_cache": dict(islice(job.url_cache.items(), cache_before, None)),
+                        },
+                        next_url=None if stop else next_article_page_url(data, page_url),
+                        listing_complete=listing_complete,
+                        scanned=scanned,
+                        reused=reused,
+                        internal_resolved=internal_resolved,
+                    )
+                page_no += 1
+                job.save()
+
+                if stop:
+                    break
+
+        if deferred_links:
+            # With the full listing, an id that never showed up is a dead reference; otherwise fall back to HTTP.
+            late: Dict[str, Dict[str, Any]] = {}
+            to_probe = []
+            for u in deferred_links:
+                where = hc_index.lookup(u)
+                if where == "ok":
+                    late[u] = INTERNAL_ARTICLE_OK
+                    internal_resolved += 1
+                elif where == "missing" and listing_complete:
+                    late[u] = INTERNAL_ARTICLE_MISSING
+                    internal_resolved += 1
+                else:
+                    to_probe.append(u)
+            if to_probe:
+                with timed_phase(scan_id, "check_urls", url_count=len(to_probe), workers=LINK_CHECK_WORKERS):
+                    late.update(check_urls_concurrent(to_probe, job.url_cache, store=url_store, **services.prober))
+            for item, statuses in deferred_items:
+                statuses.update(late)
+                job.add_findings(
+                    build_article_findings(
+                        item, statuses, do_stale=do_stale, do_alt=do_alt, do_links=do_links, do_images=do_images
+                    )
+                )
 
-        st.session_state.scan_running = False
+        learned_terms -= allow
+        if learned_terms and vocab_store is not None:
+            vocab_store.add_words(subdomain, learned_terms, "learned")
+        if do_typo:
+            job.typo_cache_stats = {"hits": vocab.hits, "misses": vocab.misses, "hit_rate": vocab.hit_rate}
+            log_event("typo_cache_stats", scan_id, hits=vocab.hits, misses=vocab.misses, hit_rate=round(vocab.hit_rate, 4))
         log_event(
             "scan_success",
             scan_id,
             user_hash=user_hash,
             user_domain=user_domain,
-            scanned_articles=len(st.session_state.scan_results),
-            findings=len(st.session_state.findings),
-        )
-
-        ads_conversion(SCAN_COMPLETED_SEND_TO, transaction_id=scan_id)
-
-        gads_event(
-            "zenaudit_scan_success",
-            scan_id=scan_id,
-            zd_subdomain=subdomain,
-            scanned_articles=len(st.session_state.scan_results),
-            findings=len(st.session_state.findings),
+            scanned_articles=len(job.results),
+            reused_articles=reused,
+            internal_links_resolved=internal_resolved,
+            findings=len(job.findings),
         )
+        log_event("http_pool_stats", scan_id, **http_pool_stats(services.http_sessions))
+        if checkpoints is not None:
+            checkpoints.forget(scan_id)
 
     except Exception as e:
-        st.session_state.scan_running = False
         log_event(
             "scan_failed",
             scan_id,
             user_hash=user_hash,
             user_domain=user_domain,
-            scanned_so_far=len(st.session_state.scan_results),
-            findings_so_far=len(st.session_state.findings),
+            scanned_so_far=len(job.results),
+            findings_so_far=len(job.findings),
             error_type=e.__class__.__name__,
             error_message_short=str(e)[:300],
             traceback=traceback.format_exc()[:4000],
         )
+        raise
 
-        gads_event(
-            "zenaudit_scan_failed",
-            scan_id=scan_id,
-            zd_subdomain=subdomain,
-            error_type=e.__class__.__name__,
+# =========================
+# 5b) BACKGROUND SCAN JOBS
+# =========================
+class ScanJob:
+    """
+    One scan running on a background thread. run_scan writes results, findings, counters and the live log here
+    (never into st.session_state); script runs copy them into the session with sync_scan_job.
+    Lists only ever grow, so a reader can pick up where it left off.
+    """
+
+    def __init__(
+        self,
+        scan_id: str,
+        subdomain: str,
+        max_articles: int,
+        store: Optional["ScanJobStore"] = None,
+        owner: str = "",
+    ):
+        self.scan_id = scan_id
+        self.subdomain = subdomain
+        # scan_owner_key of the account that started it; a page must present the same key to attach.
+        self.owner = owner
+        self.max_articles = max_articles
+        self.store = store
+        self.lock = threading.Lock()
+        self.status = "queued"  # queued -> running -> done | failed
+        self.error = ""
+        self.error_type = ""
+        self.started_at = datetime.utcnow().isoformat() + "Z"
+        self.finished_at: Optional[float] = None
+        self.events_sent = False
+        self.results: List[Dict[str, Any]] = []
+        self.findings = FindingsStore()
+        self.counters = new_scan_counters()
+        self.logs: List[str] = []
+        self.last_title = ""
+        self.connected_ok = False
+        self.typo_cache_stats: Dict[str, Any] = {}
+        self.url_cache: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def add_result(self, row: Dict[str, Any]) -> None:
+        with self.lock:
+            self.results.append(row)
+            self.counters["scanned"] += 1
+            self.counters["alt_missing"] += row.get("Alt") or 0
+            self.counters["stale"] += 1 if row.get("Stale") else 0
+
+    def add_findings(self, rows: List[Dict[str, Any]]) -> None:
+        with self.lock:
+            self.findings.extend(rows)
+            for row in rows:
+                sev = row.get("Severity")
+                if sev in ("critical", "warning"):
+                    self.counters[sev] += 1
+
+    def push_log(self, msg: str, limit: int = 14) -> None:
+        with self.lock:
+            self.logs.insert(0, msg)
+            del self.logs[limit:]
+
+    def set_title(self, title: str) -> None:
+        self.last_title = title
+
+    def mark_connected(self) -> None:
+        self.connected_ok = True
+        self.push_log("✅ Connected to Zendesk")
+
+    def set_status(self, status: str, error: str = "") -> None:
+        with self.lock:
+            self.status = status
+            self.error = error
+            if self.finished:
+                self.finished_at = time.time()
+        self.save()
+
+    def save(self) -> None:
+        if self.store is not None:
+            self.store.put(self.scan_id, self.subdomain, self.status, len(self.results), len(self.findings), self.error)
+
+class ScanServices:
+    """
+    Process-wide objects a background scan uses, resolved from the st.cache_resource getters on the script thread
+    so the scan thread never has to call them.
+    """
+
+    def __init__(self, do_typo: bool, do_links: bool, do_images: bool, incremental: bool):
+        self.http_sessions = {kind: get_http_session(kind) for kind in HTTP_POOLS}
+        self.prober = {
+            "limiter": get_host_limiter(),
+            "sess": self.http_sessions["probe"],
+            "head_memory": get_head_support_memory(),
+        }
+        self.url_store = get_url_status_cache() if (do_links or do_images) else None
+        self.article_store = get_article_result_store() if incremental else None
+        self.vocab_store = get_vocabulary_store() if do_typo else None
+        self.checkpoints = get_scan_checkpoint_store()
+        self.cpu_pool_broken = get_cpu_pool_broken()
+        self.cpu_pool = (
+            get_cpu_pool(CPU_WORKERS) if CPU_WORKERS > 1 and not self.cpu_pool_broken.is_set() else None
         )
+        # With a pool the workers load their own SpellChecker; this process only needs one without.
+        self.spell = get_spellchecker() if (do_typo and self.cpu_pool is None) else None
 
-        raise
+    def spellchecker(self) -> SpellChecker:
+        """
+        `spell`, loaded on first use when the pool broke mid-scan. Runs on the scan thread, so it
+        builds its own copy rather than calling get_spellchecker, and keeps it for the rest of the scan.
+        """
+        if self.spell is None:
+            self.spell = load_spellchecker(SPELL_DICTIONARY_PATH)
+        return self.spell
+
+class ScanJobRegistry:
+    """
+    Scans running in this server process, by scan_id. At most `max_concurrent` run at once and the rest wait
+    as "queued". Finished jobs are kept for `retention_s` so a reloaded page can reattach and read them.
+    """
+
+    def __init__(self, max_concurrent: int, retention_s: int):
+        self.retention_s = retention_s
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ScanJob] = {}
+
+    def get(self, scan_id: str) -> Optional[ScanJob]:
+        with self._lock:
+            return self._jobs.get(scan_id)
+
+    def submit(self, job: ScanJob, fn, *args, **kwargs) -> None:
+        """Registers `job` and runs fn(job, *args, **kwargs) on its own thread once a slot is free."""
+        with self._lock:
+            cutoff = time.time() - self.retention_s
+            for sid in [sid for sid, j in self._jobs.items() if j.finished_at is not None and j.finished_at < cutoff]:
+                del self._jobs[sid]
+            self._jobs[job.scan_id] = job
+        job.save()
+        threading.Thread(
+            target=self._run, args=(job, fn, args, kwargs), name=f"zenaudit-scan-{job.scan_id[:8]}", daemon=True
+        ).start()
+
+    def _run(self, job: ScanJob, fn, args, kwargs) -> None:
+        with self._slots:
+            job.set_status("running")
+            try:
+                fn(job, *args, **kwargs)
+            except Exception as e:
+                job.error_type = e.__class__.__name__
+                job.set_status("failed", str(e)[:300])
+            else:
+                job.set_status("done")
+
+@st.cache_resource(show_spinner=False)
+def get_scan_registry() -> ScanJobRegistry:
+    return ScanJobRegistry(MAX_CONCURRENT_SCANS, SCAN_JOB_RETENTION_S)
+
+def start_scan_job(
+    subdomain: str,
+    email: str,
+    token: str,
+    do_stale: bool,
+    do_typo: bool,
+    do_alt: bool,
+    do_links: bool,
+    do_images: bool,
+    max_articles: int,
+    changed_since: Optional[datetime] = None,
+    incremental: bool = False,
+    learn_dictionary: bool = True,
+    scan_id: Optional[str] = None,
+    resume: Optional[Dict[str, Any]] = None,
+) -> ScanJob:
+    """Starts a new scan, or with `scan_id` + `resume` (a loaded checkpoint) continues that scan."""
+    owner = scan_owner_key(subdomain, email)
+    job = ScanJob(
+        scan_id or str(uuid.uuid4()), subdomain, int(max_articles or 0), store=get_scan_job_store(), owner=owner
+    )
+    services = ScanServices(do_typo=do_typo, do_links=do_links, do_images=do_images, incremental=incremental)
+    if resume is not None:
+        job.url_cache.update(resume["url_cache"])
+        for row in resume["results"]:
+            job.add_result(row)
+        job.add_findings(resume["findings"])
+        job.push_log(f"↻ Resumed after {resume['scanned']} articles")
+    elif services.checkpoints is not None:
+        services.checkpoints.begin(
+            job.scan_id,
+            subdomain,
+            {
+                "do_stale": do_stale,
+                "do_typo": do_typo,
+                "do_alt": do_alt,
+                "do_links": do_links,
+                "do_images": do_images,
+                "max_articles": int(max_articles or 0),
+                "changed_since": changed_since.isoformat() if changed_since else None,
+                "incremental": incremental,
+                "learn_dictionary": learn_dictionary,
+                "owner": owner,
+            },
+        )
+    get_scan_registry().submit(
+        job,
+        run_scan,
+        services,
+        email,
+        token,
+        do_stale=do_stale,
+        do_typo=do_typo,
+        do_alt=do_alt,
+        do_links=do_links,
+        do_images=do_images,
+        changed_since=changed_since,
+        incremental=incremental,
+        learn_dictionary=learn_dictionary,
+        resume=resume,
+    )
+    return job
+
+def resume_scan_job(scan_id: str, subdomain: str, email: str, token: str) -> Tuple[Optional[ScanJob], str]:
+    """Restarts a failed/interrupted scan from its checkpoint with the scan's original options. Returns (job, error)."""
+    store = get_scan_checkpoint_store()
+    ck = store.load(scan_id) if store is not None else None
+    if ck is None:
+        return None, "No checkpoint left for this scan. Run a new scan instead."
+    if ck["subdomain"] != subdomain:
+        return None, f"This scan was for {ck['subdomain']}.zendesk.com. Connect to it in the sidebar to resume."
+    opts = ck["options"]
+    if opts.get("owner") and opts["owner"] != scan_owner_key(subdomain, email):
+        return None, "This scan was started with a different admin account. Connect with that account to resume it."
+    job = start_scan_job(
+        subdomain=subdomain,
+        email=email,
+        token=token,
+        do_stale=opts["do_stale"],
+        do_typo=opts["do_typo"],
+        do_alt=opts["do_alt"],
+        do_links=opts["do_links"],
+        do_images=opts["do_images"],
+        max_articles=opts["max_articles"],
+        changed_since=datetime.fromisoformat(opts["changed_since"]) if opts["changed_since"] else None,
+        incremental=opts["incremental"],
+        learn_dictionary=opts["learn_dictionary"],
+        scan_id=scan_id,
+        resume=ck,
+    )
+    return job, ""
+
+def resumable_scan_id(scan_id: str) -> Optional[str]:
+    """`scan_id` if that scan failed or was interrupted and has a checkpoint to resume from."""
+    if not scan_id:
+        return None
+    job = get_scan_registry().get(scan_id)
+    if job is not None:
+        stopped = job.status == "failed"
+    else:
+        job_store = get_scan_job_store()
+        row = job_store.get(scan_id) if job_store is not None else None
+        stopped = row is not None and row["status"] in ("failed", "interrupted")
+    store = get_scan_checkpoint_store()
+    if stopped and store is not None and store.progress(scan_id) is not None:
+        return scan_id
+    return None
+
+def sync_scan_job(job: ScanJob) -> None:
+    """
+    Copies the job's progress into this session (script thread only); only new result rows are copied,
+    and findings are shared with the job rather than copied.
+    """
+    ss = st.session_state
+    with job.lock:
+        ss.scan_results.extend(job.results[len(ss.scan_results) :])
+        ss.findings = job.findings
+        ss.scan_counters = dict(job.counters)
+        ss.last_logs = list(job.logs)
+        ss.scan_running = not job.finished
+    ss.scan_id = job.scan_id
+    ss.scan_started_at = job.started_at
+    ss.last_scanned_title = job.last_title
+    ss.connected_ok = job.connected_ok
+    ss.typo_cache_stats = dict(job.typo_cache_stats)
 
 # =========================
 # 6) SIDEBAR
@@ -1082,6 +3415,35 @@ with st.sidebar:
         do_stale = st.checkbox("Stale Content", value=True)
         do_typo = st.checkbox("Typos", value=True)
 
+    with st.expander("Custom dictionary"):
+        learn_dictionary = st.checkbox(
+            "Learn terms from titles & labels",
+            value=True,
+            help=(
+                "Label words and name-like title words (ACRONYMS, CamelCase) are added to this Help Center's "
+                "dictionary when the scan finishes, and apply from the next scan."
+            ),
+        )
+        vocab_store_ui = get_vocabulary_store() if subdomain else None
+        if vocab_store_ui is None:
+            st.caption("Connect to Zendesk to manage the dictionary for your Help Center.")
+        else:
+            counts = vocab_store_ui.count_words(subdomain)
+            st.caption(f"{counts.get('upload', 0)} uploaded • {counts.get('learned', 0)} learned")
+            dict_file = st.file_uploader("Word list (.txt / .csv)", type=["txt", "csv"], key="dict_upload")
+            if dict_file is not None and st.button("➕ Add words", key="dict_add"):
+                words = dictionary_words(dict_file.getvalue().decode("utf-8", errors="ignore"))
+                added = vocab_store_ui.add_words(subdomain, words, "upload")
+                # Stored typo counts were computed against the old dictionary.
+                if get_article_result_store() is not None:
+                    get_article_result_store().forget(subdomain)
+                st.toast(f"Added {added} words to the dictionary.", icon="📖")
+            if st.button("🗑️ Clear dictionary", key="dict_clear"):
+                vocab_store_ui.clear_words(subdomain)
+                if get_article_result_store() is not None:
+                    get_article_result_store().forget(subdomain)
+                st.toast("Dictionary cleared.", icon="🧼")
+
     st.divider()
     st.subheader("Limits & gating")
 
@@ -1092,6 +3454,26 @@ with st.sidebar:
 
     max_articles = st.number_input("Max Articles (0 = all)", min_value=0, value=0, step=50)
 
+    if SHOW_DEV_CONTROLS:
+        with st.expander("HTTP pools (dev)"):
+            for kind, stats in http_pool_stats().items():
+                if stats:
+                    st.caption(
+                        f"{kind}: {stats['requests']} requests • {stats['connections']} connections opened • {stats['reused']} reused"
+                    )
+
+    incremental = st.checkbox(
+        "Reuse unchanged articles",
+        value=True,
+        help="Skip re-parsing articles whose updated_at hasn't changed since the last scan. Link statuses are still re-checked once their cache entry expires.",
+    )
+
+    only_changed = st.checkbox("Only articles changed since…", value=False)
+    changed_since = None
+    if only_changed:
+        since_day = st.date_input("Changed since", value=(datetime.utcnow() - timedelta(days=7)).date())
+        changed_since = datetime(since_day.year, since_day.month, since_day.day)
+
     st.caption("Zendesk® is a trademark of Zendesk, Inc.")
 
     st.divider()
@@ -1146,7 +3528,7 @@ with tab_audit:
     <b>{FREE_FINDING_LIMIT}</b> findings.
     After the scan completes, you can export the <b>full report</b>
     (all findings + Excel export) for a <b>one-time $19 fee</b>.
-    Your export credit is used only when you download the full <b>XLSX</b> or <b>CSV</b>.
+    Your export credit is used only when you download a full export (<b>XLSX</b>, <b>CSV</b>, Parquet or JSON Lines).
   </div>
 
   <div class="za-line" style="margin-top:8px;">
@@ -1169,9 +3551,10 @@ with tab_audit:
 
     if clear_btn:
         st.session_state.scan_results = []
-        st.session_state.findings = []
+        st.session_state.findings = FindingsStore()
+        st.session_state.scan_counters = new_scan_counters()
         st.session_state.last_logs = []
-        st.session_state.url_cache = {}
+        st.session_state.typo_cache_stats = {}
         st.session_state.last_scanned_title = ""
         st.session_state.connected_ok = False
         st.session_state.pro_unlocked = False
@@ -1179,345 +3562,451 @@ with tab_audit:
         st.session_state.pro_last_status_error = ""
         st.session_state.xlsx_consumed_local = False
         st.session_state.scan_id = ""
+        st.session_state.scan_reported = ""
         st.session_state.scan_started_at = None
+        st.query_params.pop("scan", None)
         st.toast("Cleared.", icon="🧼")
 
-    m1, m2, m3, m4, m5 = st.columns(5)
-    met_scanned = m1.empty()
-    met_critical = m2.empty()
-    met_warn = m3.empty()
-    met_alt = m4.empty()
-    met_stale = m5.empty()
-
-    progress = st.progress(0, text="Ready")
-
-    left, right = st.columns([2.2, 1.2])
-    with left:
-        console = st.empty()
-
-    with right:
-        st.subheader("Scan status")
-        conn_ph = st.empty()
-        st.divider()
-        now_ph = st.empty()
-        st.divider()
-        st.markdown("**Quality signals**")
-        q1, q2 = st.columns(2)
-        with q1:
-            crit_ph = st.empty()
-            alt_ph = st.empty()
-        with q2:
-            warn_ph = st.empty()
-            stale_ph = st.empty()
-        st.divider()
-        st.caption("Tip: Fix broken links first, then images, then content quality.")
-
-    console.markdown("### Live log\n—")
-    conn_ph.info("Waiting to start")
-    now_ph.write("**Now scanning:** —")
-    crit_ph.metric("Critical", 0)
-    warn_ph.metric("Warnings", 0)
-    alt_ph.metric("Missing alt", 0)
-    stale_ph.metric("Stale", 0)
-
-    def refresh_metrics():
-        res = st.session_state.scan_results
-        fnd = st.session_state.findings
-
-        scanned = len(res)
-        critical = sum(1 for x in fnd if x.get("Severity") == "critical")
-        warning = sum(1 for x in fnd if x.get("Severity") == "warning")
-        alt_missing = sum(d.get("Alt", 0) for d in res) if res else 0
-        stale_count = sum(1 for d in res if d.get("Stale")) if res else 0
-
-        met_scanned.metric("Scanned", scanned)
-        met_critical.metric("Critical", critical)
-        met_warn.metric("Warnings", warning)
-        met_alt.metric("Alt missing", alt_missing)
-        met_stale.metric("Stale", stale_count)
-
-        if st.session_state.connected_ok:
-            conn_ph.success("✅ Connected to Zendesk")
+    # A scan that failed or was cut off can continue from its last checkpointed page.
+    resume_ph = st.empty()
+    resume_id = resumable_scan_id(st.session_state.scan_id or st.query_params.get("scan", ""))
+    resume_btn = resume_ph.button("↻ Resume scan", key="resume_scan") if resume_id else False
+
+    def scan_dashboard(job: Optional[ScanJob]) -> None:
+        """Metrics, progress bar, live log and status panel, drawn from this session's synced scan state."""
+        counters = st.session_state.scan_counters
+        scanned = counters["scanned"]
+        critical = counters["critical"]
+        warning = counters["warning"]
+        alt_missing = counters["alt_missing"]
+        stale_count = counters["stale"]
+
+        m1, m2, m3, m4, m5 = st.columns(5)
+        m1.metric("Scanned", scanned)
+        m2.metric("Critical", critical)
+        m3.metric("Warnings", warning)
+        m4.metric("Alt missing", alt_missing)
+        m5.metric("Stale", stale_count)
+
+        if job is None:
+            st.progress(0, text="Ready")
+        elif job.status == "queued":
+            st.progress(0, text="Waiting for a free scan slot…")
+        elif job.status == "done":
+            st.progress(1.0, text=f"Complete ✅ ({len(st.session_state.scan_results)} articles)")
+        elif job.finished:
+            st.progress(0, text="Scan failed")
+        elif job.max_articles:
+            pct = min(1.0, scanned / job.max_articles)
+            st.progress(pct, text=f"Scanning… {scanned}/{job.max_articles}")
         else:
-            conn_ph.info("Waiting to start")
-
-        title = st.session_state.last_scanned_title or "—"
-        now_ph.write(f"**Now scanning:** {title}")
-
-        crit_ph.metric("Critical", critical)
-        warn_ph.metric("Warnings", warning)
-        alt_ph.metric("Missing alt", alt_missing)
-        stale_ph.metric("Stale", stale_count)
+            pct = (scanned % 100) / 100
+            st.progress(pct, text=f"Scanning… {scanned} (unknown total)")
+
+        left, right = st.columns([2.2, 1.2])
+        with left:
+            logs = "<br>".join(st.session_state.last_logs) if st.session_state.last_logs else "—"
+            st.markdown(f"### Live log\n{logs}", unsafe_allow_html=True)
+
+        with right:
+            st.subheader("Scan status")
+            if st.session_state.connected_ok:
+                st.success("✅ Connected to Zendesk")
+            else:
+                st.info("Waiting to start")
+            st.divider()
+            title = st.session_state.last_scanned_title or "—"
+            st.write(f"**Now scanning:** {title}")
+            st.divider()
+            st.markdown("**Quality signals**")
+            q1, q2 = st.columns(2)
+            with q1:
+                st.metric("Critical", critical)
+                st.metric("Missing alt", alt_missing)
+            with q2:
+                st.metric("Warnings", warning)
+                st.metric("Stale", stale_count)
+            st.divider()
+            st.caption("Tip: Fix broken links first, then images, then content quality.")
+
+    @st.fragment(run_every=UI_REFRESH_INTERVAL_MS / 1000.0)
+    def live_scan(scan_id: str) -> None:
+        """
+        Follows a running scan without holding the script thread: only this fragment reruns on the
+        timer, reading the job (and its shared FindingsStore). When the job ends, the whole page reruns.
+        """
+        job = get_scan_registry().get(scan_id)
+        if job is None or job.finished:
+            st.rerun()
+        sync_scan_job(job)
+        scan_dashboard(job)
 
-    def progress_cb(scanned_count: int):
-        if max_articles:
-            pct = min(1.0, scanned_count / int(max_articles))
-            progress.progress(pct, text=f"Scanning… {scanned_count}/{int(max_articles)}")
+        st.divider()
+        st.subheader("Findings so far")
+        # A bounded slice of the append-only store: no sort or filter index is built while the version
+        # changes every tick (those are built once, for the finished scan).
+        found = len(job.findings)
+        if pro_access_active(pro_mode):
+            live_rows = job.findings.rows(max(0, found - LIVE_FINDINGS_ROWS))
+            live_rows.reverse()
+            note = f"Newest {len(live_rows)} of {found} findings."
         else:
-            pct = (scanned_count % 100) / 100
-            progress.progress(pct, text=f"Scanning… {scanned_count} (unknown total)")
-
-        refresh_metrics()
-        logs = "<br>".join(st.session_state.last_logs) if st.session_state.last_logs else "—"
-        console.markdown(f"### Live log\n{logs}", unsafe_allow_html=True)
-
-    def status_cb(_scanned_count: int):
-        refresh_metrics()
-
-    def finalize_progress(scanned_count: int):
-        progress.progress(1.0, text=f"Complete ✅ ({scanned_count} articles)")
+            live_rows = job.findings.rows(0, FREE_FINDING_LIMIT)
+            note = f"First {len(live_rows)} of {found} findings."
+        render_table_no_toolbar(
+            pd.DataFrame(live_rows, columns=list(FINDING_COLUMNS)), key="live_findings", filters=(scan_id,)
+        )
+        st.caption(f"{note} Filters, search and exports become available when the scan finishes.")
 
     if run_btn:
         if not all([subdomain, email, token]):
             st.error("Missing credentials in the sidebar. Click “Connect to Zendesk” first.")
         else:
-            try:
-                st.toast("Scan started…", icon="🚀")
-
-                st.session_state.pro_unlocked = False
-                st.session_state.pro_available_scans = 0
-                st.session_state.pro_last_status_error = ""
-                st.session_state.xlsx_consumed_local = False
+            st.session_state.pro_unlocked = False
+            st.session_state.pro_available_scans = 0
+            st.session_state.pro_last_status_error = ""
+            st.session_state.xlsx_consumed_local = False
 
-                with st.status("Running scan…", expanded=True) as s:
-                    run_scan(
-                        subdomain=subdomain,
-                        email=email,
-                        token=token,
-                        do_stale=do_stale,
-                        do_typo=do_typo,
-                        do_alt=do_alt,
-                        do_links=do_links,
-                        do_images=do_images,
-                        max_articles=int(max_articles),
-                        progress_cb=progress_cb,
-                        status_cb=status_cb,
-                    )
-                    finalize_progress(len(st.session_state.scan_results))
-                    s.update(label="Scan complete ✅", state="complete", expanded=False)
+            st.session_state.scan_results = []
+            st.session_state.findings = FindingsStore()
+            st.session_state.scan_counters = new_scan_counters()
+            st.session_state.last_logs = []
+
+            job = start_scan_job(
+                subdomain=subdomain,
+                email=email,
+                token=token,
+                do_stale=do_stale,
+                do_typo=do_typo,
+                do_alt=do_alt,
+                do_links=do_links,
+                do_images=do_images,
+                max_articles=int(max_articles),
+                changed_since=changed_since,
+                incremental=incremental,
+                learn_dictionary=learn_dictionary,
+            )
+            st.session_state.scan_id = job.scan_id
+            st.session_state.scan_reported = ""
+            st.query_params["scan"] = job.scan_id
+            st.toast("Scan started…", icon="🚀")
+            gads_event(
+                "zenaudit_scan_start",
+                scan_id=job.scan_id,
+                zd_subdomain=subdomain,
+                do_links=int(bool(do_links)),
+                do_images=int(bool(do_images)),
+                do_alt=int(bool(do_alt)),
+                do_typo=int(bool(do_typo)),
+                do_stale=int(bool(do_stale)),
+            )
 
+    if resume_btn:
+        if not all([subdomain, email, token]):
+            st.error("Missing credentials in the sidebar. Click “Connect to Zendesk” first.")
+        else:
+            job, resume_err = resume_scan_job(resume_id, subdomain, email, token)
+            if job is None:
+                st.error(resume_err)
+            else:
+                resume_ph.empty()
+                st.session_state.scan_results = []
+                st.session_state.findings = FindingsStore()
+                st.session_state.scan_counters = new_scan_counters()
+                st.session_state.last_logs = []
+                st.session_state.scan_id = job.scan_id
+                st.session_state.scan_reported = ""
+                st.query_params["scan"] = job.scan_id
+                st.toast("Scan resumed…", icon="🔁")
+
+    # The scan runs in the background; this run (or any later one, e.g. after a reload with ?scan=<id>) follows it.
+    attach_id = st.session_state.scan_id or st.query_params.get("scan", "")
+    live_job: Optional[ScanJob] = None
+    dash_job: Optional[ScanJob] = None
+    if attach_id and attach_id != st.session_state.scan_reported:
+        job = get_scan_registry().get(attach_id)
+        if job is not None and job.owner != scan_owner_key(subdomain, email):
+            # A scan_id alone (e.g. a shared ?scan= link) doesn't grant access; not marked reported,
+            # so connecting with the right account attaches on the next run.
+            st.info("Connect to Zendesk with the account that started this scan to see its progress and results.")
+        elif job is None:
+            store = get_scan_job_store()
+            row = store.get(attach_id) if store is not None else None
+            if row is not None and row["status"] in ("queued", "running"):
+                st.info(
+                    f"Scan {attach_id} is still running in another server process ({row['scanned']} articles so far). "
+                    "Its results are only available there."
+                )
+            elif row is not None and row["status"] != "done":
+                st.warning(
+                    f"Scan {attach_id} stopped before finishing ({row['status']}, {row['scanned']} articles). "
+                    + ("Resume it to continue where it left off." if resume_id else "Run it again to get full results.")
+                )
+            elif attach_id != st.session_state.scan_id:
+                st.info("That scan is no longer available on this server. Run a new scan to see results.")
+            st.session_state.scan_reported = attach_id
+        elif not job.finished:
+            live_job = job
+        else:
+            sync_scan_job(job)
+            dash_job = job
+            if job.status == "done":
                 st.toast("Scan complete", icon="✅")
-            except Exception as e:
-                st.session_state.scan_running = False
-                sid = st.session_state.scan_id or "unknown"
-                st.error(f"Scan failed (ID: {sid}). Error: {e}")
+            else:
+                st.error(f"Scan failed (ID: {job.scan_id}). Error: {job.error}")
+                if resume_id is None and resumable_scan_id(job.scan_id):
+                    resume_ph.button("↻ Resume scan", key="resume_scan")
+
+            # Conversion/analytics fire once per scan, from whichever page saw it finish.
+            if not job.events_sent:
+                job.events_sent = True
+                if job.status == "done":
+                    ads_conversion(SCAN_COMPLETED_SEND_TO, transaction_id=job.scan_id)
+                    gads_event(
+                        "zenaudit_scan_success",
+                        scan_id=job.scan_id,
+                        zd_subdomain=job.subdomain,
+                        scanned_articles=len(job.results),
+                        findings=len(job.findings),
+                    )
+                else:
+                    gads_event(
+                        "zenaudit_scan_failed",
+                        scan_id=job.scan_id,
+                        zd_subdomain=job.subdomain,
+                        error_type=job.error_type,
+                    )
+            st.session_state.scan_reported = job.scan_id
 
-    refresh_metrics()
+    if live_job is not None:
+        # Polled by the fragment's timer; the rest of the tab (filters, full table, exports) waits for the
+        # full rerun the fragment triggers when the scan ends.
+        live_scan(live_job.scan_id)
+    else:
+        scan_dashboard(dash_job)
 
-    st.divider()
+        st.divider()
 
-    if st.session_state.scan_results:
-        st.markdown(
-            """
+        if st.session_state.scan_results:
+            st.markdown(
+                """
 <div class="za-next">
   👉 <b>Next step</b><br>
   <span>Review the free preview below. Export the full report after the table if you want the complete export.</span>
 </div>
 """,
-            unsafe_allow_html=True,
-        )
-    else:
-        st.markdown(
-            """
+                unsafe_allow_html=True,
+            )
+        else:
+            st.markdown(
+                """
 <div class="za-next">
   👉 <b>Next step</b><br>
   <span>Run a scan to generate a free preview. You can buy an export credit anytime to unlock downloads.</span>
 </div>
 """,
-            unsafe_allow_html=True,
-        )
-
-    st.subheader("Findings")
-
-    df_findings = (
-        pd.DataFrame(st.session_state.findings)
-        if st.session_state.findings
-        else pd.DataFrame(
-            columns=[
-                "Severity",
-                "Type",
-                "Article Title",
-                "Article URL",
-                "Target URL",
-                "HTTP Status",
-                "Detail",
-                "Suggested Fix",
-            ]
-        )
-    )
-
-    if not df_findings.empty:
-        df_findings["_sev_rank"] = df_findings["Severity"].map(lambda s: severity_rank(str(s)))
-        df_findings = df_findings.sort_values(by=["_sev_rank", "Type"], ascending=[True, True]).drop(columns=["_sev_rank"])
-
-    total_findings = len(df_findings)
-
-    pro_access = pro_access_active(pro_mode)
-    gated = (not pro_access) and (total_findings > FREE_FINDING_LIMIT)
-    df_preview = df_findings.head(FREE_FINDING_LIMIT) if gated else df_findings
-
-    if not df_preview.empty:
-        f1, f2, f3 = st.columns([1.2, 1.2, 2.6])
-        with f1:
-            sev_filter = st.multiselect("Severity", ["critical", "warning", "info"], default=["critical", "warning", "info"])
-        with f2:
-            type_opts = sorted(df_preview["Type"].unique().tolist()) if not df_preview.empty else []
-            type_filter = st.multiselect("Type", type_opts, default=type_opts)
-        with f3:
-            q = st.text_input("Search (title/url contains)", placeholder="e.g. billing, /hc/en-us, image.png")
-
-        view = df_preview.copy()
-        view = view[view["Severity"].isin(sev_filter)]
-        if type_filter:
-            view = view[view["Type"].isin(type_filter)]
-        if q.strip():
-            qq = q.strip().lower()
-            view = view[
-                view["Article Title"].fillna("").str.lower().str.contains(qq)
-                | view["Article URL"].fillna("").str.lower().str.contains(qq)
-                | view["Target URL"].fillna("").str.lower().str.contains(qq)
-            ]
-        render_table_no_toolbar(view)
-    else:
-        render_table_no_toolbar(df_preview)
-
-    if st.session_state.scan_results:
-        st.info(f"Scanned **{len(st.session_state.scan_results)}** articles. Found **{total_findings}** findings.")
-        if gated:
-            st.warning(f"Free preview shows the first **{FREE_FINDING_LIMIT}** findings. Export the full report by purchasing an export credit.")
-    else:
-        st.info("No scan results yet. Run a scan above to populate the preview table.")
-
-    st.markdown("### 🔓 Export full report")
+                unsafe_allow_html=True,
+            )
 
-    uL, uR = st.columns([1.8, 2.2])
+        st.subheader("Findings")
+
+        # Built once per findings version (not per rerun); read-only.
+        df_findings = st.session_state.findings.report_frame()
+
+        total_findings = len(df_findings)
+
+        pro_access = pro_access_active(pro_mode)
+        gated = (not pro_access) and (total_findings > FREE_FINDING_LIMIT)
+        preview_limit = FREE_FINDING_LIMIT if gated else None
+
+        if total_findings:
+            findings_store = st.session_state.findings
+            f1, f2, f3 = st.columns([1.2, 1.2, 2.6])
+            with f1:
+                sev_filter = st.multiselect("Severity", ["critical", "warning", "info"], default=["critical", "warning", "info"])
+            with f2:
+                type_opts = findings_store.finding_types(preview_limit)
+                type_filter = st.multiselect("Type", type_opts, default=type_opts)
+            with f3:
+                q = st.text_input("Search (title/url contains)", placeholder="e.g. billing, /hc/en-us, image.png")
+
+            # Filters run against the per-version index (categorical codes + one lowercased search
+            # column), not a fresh copy of the frame per rerun.
+            render_table_no_toolbar(
+                findings_store.filter(sev_filter, type_filter, q, limit=preview_limit),
+                filters=(st.session_state.scan_id, tuple(sev_filter), tuple(type_filter), q, preview_limit),
+            )
+        else:
+            render_table_no_toolbar(df_findings)
+
+        if st.session_state.scan_results:
+            st.info(f"Scanned **{len(st.session_state.scan_results)}** articles. Found **{total_findings}** findings.")
+            tstats = st.session_state.typo_cache_stats
+            if tstats and (tstats["hits"] + tstats["misses"]):
+                st.caption(
+                    f"Typo check: {tstats['hit_rate']:.0%} of word lookups served from the vocabulary cache "
+                    f"({tstats['hits']} cached, {tstats['misses']} checked)."
+                )
+            if gated:
+                st.warning(f"Free preview shows the first **{FREE_FINDING_LIMIT}** findings. Export the full report by purchasing an export credit.")
+        else:
+            st.info("No scan results yet. Run a scan above to populate the preview table.")
+
+        st.markdown("### 🔓 Export full report")
+
+        uL, uR = st.columns([1.8, 2.2])
+
+        with uL:
+            st.markdown("**Step 1 — Buy 1 export credit**")
+            link_cta("💳 Buy 1 export credit ($19)", pay_url)
+            st.markdown("<div class='za-subtle' style='margin-top:6px;'>Only buy if you want to download exports.</div>", unsafe_allow_html=True)
+
+        with uR:
+            st.markdown("**Step 2 — Verify purchase**")
+            unlock_email = st.text_input(
+                "Email used at checkout",
+                value=st.session_state.pro_email,
+                placeholder="admin@company.com",
+                label_visibility="visible",
+                key="unlock_email_main",
+            ).strip().lower()
+            st.session_state.pro_email = unlock_email
+
+            if unlock_email and not is_valid_email_format(unlock_email):
+                st.error("Enter a valid checkout email (example: admin@company.com).")
+
+            unlock_btn = st.button(
+                "✅ Verify purchase",
+                use_container_width=True,
+                disabled=(not bool(unlock_email)) or (not is_valid_email_format(unlock_email)) or ((not base) and (not pro_mode)),
+                key="btn_unlock_paid",
+            )
 
-    with uL:
-        st.markdown("**Step 1 — Buy 1 export credit**")
-        link_cta("💳 Buy 1 export credit ($19)", pay_url)
-        st.markdown("<div class='za-subtle' style='margin-top:6px;'>Only buy if you want to download exports.</div>", unsafe_allow_html=True)
-
-    with uR:
-        st.markdown("**Step 2 — Verify purchase**")
-        unlock_email = st.text_input(
-            "Email used at checkout",
-            value=st.session_state.pro_email,
-            placeholder="admin@company.com",
-            label_visibility="visible",
-            key="unlock_email_main",
-        ).strip().lower()
-        st.session_state.pro_email = unlock_email
-
-        if unlock_email and not is_valid_email_format(unlock_email):
-            st.error("Enter a valid checkout email (example: admin@company.com).")
-
-        unlock_btn = st.button(
-            "✅ Verify purchase",
-            use_container_width=True,
-            disabled=(not bool(unlock_email)) or (not is_valid_email_format(unlock_email)) or ((not base) and (not pro_mode)),
-            key="btn_unlock_paid",
-        )
+            st.markdown("<div class='za-subtle'>Use the same email you used at Stripe checkout.</div>", unsafe_allow_html=True)
 
-        st.markdown("<div class='za-subtle'>Use the same email you used at Stripe checkout.</div>", unsafe_allow_html=True)
+            if (not base) and (not pro_mode):
+                st.markdown("<div class='za-pill-warn'>⚠️ Paywall not configured (missing WORKER_BASE_URL secret).</div>", unsafe_allow_html=True)
 
-        if (not base) and (not pro_mode):
-            st.markdown("<div class='za-pill-warn'>⚠️ Paywall not configured (missing WORKER_BASE_URL secret).</div>", unsafe_allow_html=True)
+        if unlock_btn:
+            if pro_mode:
+                st.session_state.pro_unlocked = True
+                st.session_state.pro_available_scans = max(1, int(st.session_state.pro_available_scans or 1))
+                st.session_state.pro_last_status_error = ""
+                st.session_state.xlsx_consumed_local = False
+                st.toast("Export credit available (dev) ✅", icon="✅")
+                st.rerun()
+            else:
+                try_unlock_from_status(st.session_state.pro_email)
+                if st.session_state.pro_unlocked:
+                    st.toast("Export credit available ✅", icon="✅")
+                    st.rerun()
 
-    if unlock_btn:
         if pro_mode:
-            st.session_state.pro_unlocked = True
-            st.session_state.pro_available_scans = max(1, int(st.session_state.pro_available_scans or 1))
-            st.session_state.pro_last_status_error = ""
-            st.session_state.xlsx_consumed_local = False
-            st.toast("Export credit available (dev) ✅", icon="✅")
-            st.rerun()
+            st.markdown("<div class='za-pill-ok'>✅ Pro Mode enabled (dev) — export available.</div>", unsafe_allow_html=True)
         else:
-            try_unlock_from_status(st.session_state.pro_email)
             if st.session_state.pro_unlocked:
-                st.toast("Export credit available ✅", icon="✅")
-                st.rerun()
-
-    if pro_mode:
-        st.markdown("<div class='za-pill-ok'>✅ Pro Mode enabled (dev) — export available.</div>", unsafe_allow_html=True)
-    else:
-        if st.session_state.pro_unlocked:
-            st.markdown(
-                f"<div class='za-pill-ok'>✅ Export credit available • Credits remaining: {st.session_state.pro_available_scans}"
-                f"<br><span style='color: rgba(255,255,255,.85); font-weight:600;'>Downloading uses 1 export credit. Save the file after downloading.</span></div>",
-                unsafe_allow_html=True,
-            )
-        else:
-            msg = st.session_state.pro_last_status_error or (
-                "Buy 1 export credit, then verify with your checkout email to unlock downloads."
-            )
-            st.markdown(f"<div class='za-pill-info'>ℹ️ {msg}</div>", unsafe_allow_html=True)
-
-    st.markdown("<div style='height:14px;'></div>", unsafe_allow_html=True)
+                st.markdown(
+                    f"<div class='za-pill-ok'>✅ Export credit available • Credits remaining: {st.session_state.pro_available_scans}"
+                    f"<br><span style='color: rgba(255,255,255,.85); font-weight:600;'>Downloading uses 1 export credit. Save the file after downloading.</span></div>",
+                    unsafe_allow_html=True,
+                )
+            else:
+                msg = st.session_state.pro_last_status_error or (
+                    "Buy 1 export credit, then verify with your checkout email to unlock downloads."
+                )
+                st.markdown(f"<div class='za-pill-info'>ℹ️ {msg}</div>", unsafe_allow_html=True)
 
-    pro_access = pro_access_active(pro_mode)
-    xlsx_bytes, xlsx_err = get_xlsx_bytes_safe(df_findings) if total_findings > 0 else (None, None)
+        st.markdown("<div style='height:14px;'></div>", unsafe_allow_html=True)
 
-    def _consume_once():
-        if pro_mode:
-            return
-        if st.session_state.xlsx_consumed_local:
-            return
-        if not st.session_state.pro_email:
-            st.warning("Enter your email above to use an export credit.")
-            return
-
-        ok, avail, err = worker_consume(st.session_state.pro_email)
-        if ok:
-            st.session_state.xlsx_consumed_local = True
-            st.session_state.pro_unlocked = False
-            st.session_state.pro_available_scans = avail
-            st.toast("Export credit used ✅ (download)", icon="✅")
-        else:
-            st.warning(err or "Could not use export credit (try again).")
+        pro_access = pro_access_active(pro_mode)
+        # Export files are built only when a download is clicked, once per scan + findings version + format.
+        export_key = (st.session_state.scan_id, st.session_state.findings.version)
+        articles = st.session_state.scan_results
 
-    d1, d2 = st.columns([2.2, 1.8])
+        def _build_export_data(fmt: str) -> bytes:
+            data, err = build_export(fmt, df_findings, articles)
+            if data is None:
+                raise RuntimeError(err)
+            return data
 
-    with d1:
-        if total_findings <= 0:
-            st.button("📥 Download XLSX (locked)", disabled=True, use_container_width=True)
-            st.caption("Run a scan to generate a report preview.")
-        else:
-            if not pro_access:
-                st.button("📥 Download XLSX (locked)", disabled=True, use_container_width=True)
+        def _export_data(fmt: str) -> bytes:
+            try:
+                return get_export_cache().get_or_build((*export_key, fmt), partial(_build_export_data, fmt))
+            except Exception as e:
+                log_event("export_failed", export_key[0], format=fmt, error_message_short=str(e)[:300])
+                raise
+
+        def _consume_once():
+            if pro_mode:
+                return
+            if st.session_state.xlsx_consumed_local:
+                return
+            if not st.session_state.pro_email:
+                st.warning("Enter your email above to use an export credit.")
+                return
+
+            ok, avail, err = worker_consume(st.session_state.pro_email)
+            if ok:
+                st.session_state.xlsx_consumed_local = True
+                st.session_state.pro_unlocked = False
+                st.session_state.pro_available_scans = avail
+                st.toast("Export credit used ✅ (download)", icon="✅")
+            else:
+                st.warning(err or "Could not use export credit (try again).")
+
+        def _export_button(fmt: str, key: str) -> None:
+            spec = EXPORT_FORMATS[fmt]
+            label = f"📥 Download {spec['label']}"
+            if total_findings <= 0:
+                st.button(f"{label} (locked)", disabled=True, use_container_width=True, key=f"{key}_locked")
+                st.caption("Run a scan to generate a report preview.")
+            elif not pro_access:
+                st.button(f"{label} (locked)", disabled=True, use_container_width=True, key=f"{key}_locked")
                 st.caption("Buy 1 export credit to download exports.")
             else:
-                if xlsx_bytes:
+                fmt_err = export_format_error(fmt)
+                build_err = get_export_cache().error((*export_key, fmt))
+                if build_err:
+                    st.error(f"Building the {spec['label']} file failed: {build_err}. Click to try again.")
+                if not fmt_err:
                     st.download_button(
-                        "📥 Download XLSX" + ("" if pro_mode else " (uses 1 export credit)"),
-                        data=xlsx_bytes,
-                        file_name="zenaudit_report.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        label + ("" if pro_mode else " (uses 1 export credit)"),
+                        data=partial(_export_data, fmt),
+                        file_name=spec["file_name"],
+                        mime=spec["mime"],
                         use_container_width=True,
                         on_click=_consume_once,
-                        key="download_xlsx_btn",
+                        key=key,
                     )
                 else:
-                    st.button("📥 Download XLSX", disabled=True, use_container_width=True)
-                    st.caption(xlsx_err or "XLSX export unavailable.")
+                    st.button(label, disabled=True, use_container_width=True, key=f"{key}_unavailable")
+                    st.caption(fmt_err)
 
-    with d2:
-        if total_findings <= 0:
-            st.button("📥 Download CSV (locked)", disabled=True, use_container_width=True)
-            st.caption("Run a scan to generate a report preview.")
-        else:
-            if not pro_access:
-                st.button("📥 Download CSV (locked)", disabled=True, use_container_width=True)
-                st.caption("Buy 1 export credit to download exports.")
-            else:
-                st.download_button(
-                    "📥 Download CSV" + ("" if pro_mode else " (uses 1 export credit)"),
-                    data=df_findings.to_csv(index=False),
-                    file_name="zenaudit_report.csv",
-                    mime="text/csv",
-                    use_container_width=True,
-                    on_click=_consume_once,
-                    key="download_csv_btn",
+        d1, d2 = st.columns([2.2, 1.8])
+
+        with d1:
+            _export_button("xlsx", "download_xlsx_btn")
+
+        with d2:
+            _export_button("csv", "download_csv_btn")
+
+        with st.expander("More export formats (Parquet, gzip CSV, JSON Lines)"):
+            st.caption(
+                "Compact formats for large help centers and data tools. "
+                "Parquet keeps Severity/Type as categories; JSON Lines has one finding per line."
+            )
+            other_formats = [f for f in EXPORT_FORMATS if f not in ("xlsx", "csv")]
+            o1, o2 = st.columns([1.4, 2.6])
+            with o1:
+                fmt = st.selectbox(
+                    "Format",
+                    other_formats,
+                    format_func=lambda f: EXPORT_FORMATS[f]["label"],
+                    key="export_format",
+                    label_visibility="collapsed",
                 )
+            with o2:
+                _export_button(fmt, "download_other_btn")
 
 # =========================
 # 9) OTHER TABS
@@ -1527,12 +4016,16 @@ with tab_method:
         """
 ### Metric definitions
 - **Stale Content:** Articles not updated in **365 days**
-- **Typo detection:** `pyspellchecker`, filtering short/non-alpha noise
+- **Typo detection:** `pyspellchecker`, filtering short/non-alpha noise and skipping words in your custom dictionary
 - **Alt-text:** `<img>` tags missing meaningful `alt`
 - **Broken links/images:** HTTP status:
   - 404/410 → critical
   - 5xx/timeout/request errors → warning
   - 401/403/429 → inconclusive (often blocked/auth/rate-limited)
+  - Checked with HEAD, or a 1-byte ranged GET when a host doesn't answer HEAD; file bodies are never downloaded
+  - URLs are canonicalized first (host case, default ports, fragments and tracking params like utm_* are ignored)
+  - Redirects are followed hop by hop; broken links show the chain, and redirect-heavy working links are listed as info
+- **Internal article links:** links to this Help Center's own articles are matched against the article list instead of being requested; ids missing from a full listing are critical
 """
     )
 
@@ -1544,7 +4037,11 @@ with tab_privacy:
 - Direct HTTPS calls to your Zendesk subdomain
 - Tokens are used only during the scan to fetch Help Center content
 - Tokens are not written into exports
-- Results live in Streamlit session state and reset when you clear or rerun
+- Scans run in the background on the server; results stay in server memory for up to an hour so a reloaded page (its `?scan=` link) can pick them up, then are dropped
+- Scan status (article/finding counts only) is recorded on the server so an interrupted scan can be reported
+- While a scan runs, its results so far are checkpointed on the server so a failed scan can be resumed; the checkpoint is deleted when the scan completes (or after 7 days). Tokens are never checkpointed
+- Link/image check outcomes (URL + HTTP status only) are cached on the server for up to 24 hours to speed up rescans
+- With "Reuse unchanged articles", per-article check summaries (counts, link/image URLs) are kept on the server to skip unchanged articles next time
 """
     )
 
@@ -1560,7 +4057,7 @@ with tab_pro:
     with c2:
         st.subheader("Paid ($19 / export credit)")
         st.write("🚀 Full findings (beyond preview)")
-        st.write("📥 XLSX + CSV exports (uses 1 export credit)")
+        st.write("📥 XLSX, CSV, Parquet & JSON Lines exports (uses 1 export credit)")
         link_cta("💳 Buy 1 export credit ($19)", pay_url)
 
     st.divider()
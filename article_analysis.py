@@ -0,0 +1,224 @@
+# =========================
+# ZenAudit — article content analysis
+# Pure Python, no Streamlit: imported by app.py and by the process-pool workers
+# (Streamlit executes app.py as a script, so its functions can't be pickled into workers).
+# =========================
+import re
+from html.parser import HTMLParser
+from typing import Optional, Dict, Any, FrozenSet, List, Set, Tuple
+from urllib.parse import urljoin
+
+from spellchecker import SpellChecker
+
+WORD_RE = re.compile(r"[a-zA-Z']+")
+
+def load_spellchecker(dictionary_path: str = "") -> SpellChecker:
+    """
+    Builds a SpellChecker (~0.3s and ~40MB for the bundled English dictionary).
+    `dictionary_path` points at a pre-serialized pyspellchecker dictionary (.json / .json.gz), e.g. a pruned
+    one written with `word_frequency.remove_by_threshold(n)` + `export(path, gzipped=True)`; empty = bundled English.
+    """
+    if dictionary_path:
+        return SpellChecker(language=None, local_dictionary=dictionary_path)
+    return SpellChecker()
+
+def normalize_url(base_url: str, raw: Optional[str]) -> Optional[str]:
+    if not raw:
+        return None
+    raw = raw.strip()
+    if raw.startswith(("mailto:", "tel:", "javascript:")):
+        return None
+    if raw.startswith("#"):
+        return None
+    return urljoin(base_url, raw)
+
+class ArticleHTMLAnalyzer(HTMLParser):
+    """
+    Single streaming pass over an article body: collects links, images (with alt status)
+    and visible text without building a document tree.
+    Text matches BeautifulSoup's get_text(" ", strip=True): script/style/template content and comments are skipped.
+    """
+
+    _SKIP_TEXT_TAGS = ("script", "style", "template")
+
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.links: List[str] = []
+        self.images: List[Dict[str, Any]] = []
+        self.alt_missing = 0
+        self._text: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag in self._SKIP_TEXT_TAGS:
+            self._skip_depth += 1
+            return
+        if tag == "a":
+            u = normalize_url(self.base_url, dict(attrs).get("href"))
+            if u:
+                self.links.append(u)
+        elif tag == "img":
+            a = dict(attrs)
+            missing_alt = not (a.get("alt") or "").strip()
+            if missing_alt:
+                self.alt_missing += 1
+            u = normalize_url(self.base_url, a.get("src"))
+            if u:
+                self.images.append({"src": u, "missing_alt": missing_alt})
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        # <img/>, <br/>: never opens a skipped-text element
+        if tag not in self._SKIP_TEXT_TAGS:
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._SKIP_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            t = data.strip()
+            if t:
+                self._text.append(t)
+
+    def unknown_decl(self, data: str) -> None:
+        # <![CDATA[...]]> counts as text, as in BeautifulSoup
+        if data.startswith("CDATA["):
+            self.handle_data(data[6:])
+
+    @property
+    def text(self) -> str:
+        return " ".join(self._text)
+
+def extract_links_images(html: str, base_url: str) -> Tuple[str, List[str], List[Dict[str, Any]], int]:
+    """Returns (visible text, link URLs, images, count of <img> tags missing alt)."""
+    parser = ArticleHTMLAnalyzer(base_url)
+    parser.feed(html or "")
+    parser.close()
+    return parser.text, parser.links, parser.images, parser.alt_missing
+
+class WordVerdictCache:
+    """
+    Memoized spellchecker verdicts (word -> known?) shared across articles.
+    Only never-seen tokens reach the spellchecker; `learned` holds verdicts added since the last drain.
+    """
+
+    def __init__(self, verdicts: Optional[Dict[str, bool]] = None):
+        self.known: Dict[str, bool] = dict(verdicts or {})
+        self.learned: Dict[str, bool] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def unknown(self, words: Set[str], spell: SpellChecker) -> Set[str]:
+        new = [w for w in words if w not in self.known]
+        self.hits += len(words) - len(new)
+        self.misses += len(new)
+        if new:
+            unk = spell.unknown(new)
+            for w in new:
+                self.known[w] = self.learned[w] = w not in unk
+        return {w for w in words if not self.known[w]}
+
+    def merge(self, learned: Dict[str, bool], hits: int = 0, misses: int = 0) -> None:
+        """Folds in verdicts/counters produced elsewhere (e.g. by a pool worker)."""
+        for w, v in learned.items():
+            if w not in self.known:
+                self.known[w] = self.learned[w] = v
+        self.hits += hits
+        self.misses += misses
+
+    def drain_learned(self) -> Dict[str, bool]:
+        out, self.learned = self.learned, {}
+        return out
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return (self.hits / total) if total else 0.0
+
+def dictionary_words(raw: str) -> Set[str]:
+    """Lower-cased tokens from an uploaded word list (any mix of newlines, commas, spaces)."""
+    return {w for w in WORD_RE.findall((raw or "").lower()) if len(w) > 2 and w.isalpha()}
+
+def learn_terms(title: str, labels: Optional[List[str]]) -> Set[str]:
+    """
+    Terms to trust from article metadata: every label token, plus title tokens that look like
+    names or acronyms (ALLCAPS, CamelCase / inner capitals). Plain title words are left to the spellchecker.
+    """
+    terms: Set[str] = set()
+    for label in labels or []:
+        terms.update(dictionary_words(label))
+    for w in WORD_RE.findall(title or ""):
+        if len(w) > 1 and (w.isupper() or any(c.isupper() for c in w[1:])):
+            terms.add(w.lower())
+    return {t for t in terms if len(t) > 2 and t.isalpha()}
+
+def count_typos(
+    text: str,
+    spell: SpellChecker,
+    vocab: Optional[WordVerdictCache] = None,
+    allow: FrozenSet[str] = frozenset(),
+) -> int:
+    """Distinct unknown words longer than two letters (apostrophe forms skipped), ignoring `allow`-listed words."""
+    # Only these tokens can count, so filter before asking the spellchecker (verdicts are per word).
+    words = {w for w in WORD_RE.findall((text or "").lower()) if len(w) > 2 and w.isalpha()}
+    words -= allow
+    if vocab is not None:
+        return len(vocab.unknown(words, spell))
+    return len(spell.unknown(words))
+
+def analyze_body(
+    body: str,
+    base_url: str,
+    do_typo: bool,
+    spell: Optional[SpellChecker],
+    vocab: Optional[WordVerdictCache] = None,
+    allow: FrozenSet[str] = frozenset(),
+) -> Dict[str, Any]:
+    """
+    Content checks for one article body. The result depends only on the body.
+    `typos` is None when the typo check was skipped.
+    """
+    text_raw, links, images, alt_miss = extract_links_images(body, base_url=base_url)
+    typos = count_typos(text_raw, spell, vocab, allow) if (do_typo and spell is not None) else None
+    return {
+        "typos": typos,
+        "alt_miss": alt_miss,
+        "links": list(dict.fromkeys(links)),
+        "images": images,
+    }
+
+# =========================
+# Process-pool worker entry points
+# =========================
+_worker_spell: Optional[SpellChecker] = None
+_worker_dictionary_path = ""
+# One verdict cache per knowledge base, kept for the life of the worker process.
+_worker_vocab: Dict[str, WordVerdictCache] = {}
+
+def init_worker(dictionary_path: str = "") -> None:
+    """Pool initializer. The SpellChecker itself is loaded on the worker's first typo job."""
+    global _worker_dictionary_path
+    _worker_dictionary_path = dictionary_path
+
+def _get_worker_spell() -> SpellChecker:
+    global _worker_spell
+    if _worker_spell is None:
+        _worker_spell = load_spellchecker(_worker_dictionary_path)
+    return _worker_spell
+
+def analyze_body_job(
+    job: Tuple[str, str, bool, str],
+    allow: FrozenSet[str] = frozenset(),
+) -> Tuple[Dict[str, Any], Dict[str, bool], int, int]:
+    """
+    Returns (analysis, newly learned verdicts, cache hits, cache misses) for one article.
+    Bind `allow` with functools.partial so it is pickled once per chunk, not once per article.
+    """
+    body, base_url, do_typo, vocab_key = job
+    vocab = _worker_vocab.setdefault(vocab_key, WordVerdictCache())
+    hits, misses = vocab.hits, vocab.misses
+    spell = _get_worker_spell() if do_typo else None
+    analysis = analyze_body(body, base_url, do_typo, spell, vocab, allow)
+    return analysis, vocab.drain_learned(), vocab.hits - hits, vocab.misses - misses